@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark Module
+Times startup imports and the main processing stages on generated plans and XML schedules.
+
+Usage:
+    python benchmark.py [--gateways 30] [--tracks 200] [--satellites 300] [--repeat 3]
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+# Modules that should only be imported on the code paths that need them
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly')
+
+def generate_xml(satellites=8, seed=1, day=datetime(2024, 3, 1)):
+    """Generate a 6-hour gateway XML schedule with a mix of OK, SHORT, LONG and gap tracks."""
+    rng = random.Random(seed)
+    current = day
+    lines = ['<?xml version="1.0"?>', '<Schedule>']
+    for i in range(satellites):
+        start = current
+        end = start + timedelta(minutes=rng.choice([20, 30, 40, 50]))
+        lines.append(f'<Track Satellite="O3B FM{i + 1}" StartTime="{start:%m/%d/%Y %H:%M:%S}" '
+                     f'EndTime="{end:%m/%d/%Y %H:%M:%S}"/>')
+        current = end - timedelta(minutes=rng.choice([-2, 0, 1, 2]))
+    lines.append('</Schedule>')
+    return '\n'.join(lines)
+
+def generate_plan(gateways=5, tracks=50, satellites=20, seed=2, day=datetime(2024, 3, 1), prefix='GS_GW'):
+    """Generate a full plan TXT with `gateways` sections of `tracks` chained tracks each."""
+    rng = random.Random(seed)
+    lines = [str(int(day.timestamp() * 1000)), day.strftime('%Y%m%d%H%M%S.000')]
+    for g in range(gateways):
+        lines.append(f'{prefix}{g:02d}')
+        current = day
+        for _ in range(tracks):
+            start = current
+            end = start + timedelta(minutes=rng.choice([20, 30, 35, 40, 50]))
+            lines.append(f'FM{rng.randrange(satellites) + 1} DAT RECUR {start:%Y%m%d%H%M%S}.000 {end:%Y%m%d%H%M%S}.000')
+            current = end - timedelta(minutes=rng.choice([-3, 0, 1, 2, 3]))
+    return '\n'.join(lines) + '\n'
+
+def import_time_report(module='main', top=8):
+    """Import a module in a fresh interpreter with -X importtime and summarize the result."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nesting is shown as two extra spaces of indentation per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((int(cumulative_us), depth, name.strip()))
+
+    total = next((cumulative for cumulative, depth, name in entries if depth == 0 and name == module), 0)
+    loaded = {name.split('.')[0] for _, _, name in entries}
+    direct = sorted(((cumulative, name) for cumulative, depth, name in entries if depth == 1), reverse=True)
+
+    lines = [f"Import time for '{module}': {total / 1000:.1f} ms"]
+    lines.append("  Heavy modules loaded at import: " +
+                 (", ".join(m for m in HEAVY_MODULES if m in loaded) or "none"))
+    for cumulative, name in direct[:top]:
+        lines.append(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return '\n'.join(lines)
+
+def best_of(repeat, func, *args):
+    """Return (best seconds, last result) over `repeat` runs."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STP Track Tool startup and processing stages.")
+    parser.add_argument('--gateways', type=int, default=30)
+    parser.add_argument('--tracks', type=int, default=200, help="Tracks per gateway")
+    parser.add_argument('--satellites', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print("== Startup ==")
+    for module in ('main', 'plan_merge', 'plan_batch', 'watch_folder'):
+        print(import_time_report(module))
+
+    # Pay the deferred imports up front so they do not skew the first stage timed below
+    start = time.perf_counter()
+    import pandas, plotly.graph_objects  # noqa: F401
+    print(f"Deferred import of pandas + plotly on first analysis: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print("\n== Processing ==")
+    from xml_analysis import parse_xml, build_txt
+    from plan_merge import merge_plans
+    import plan_analysis
+    from plan_analysis import analyze_plan_txt_file, flag_satellite_conflicts, generate_gantt_multi_gateway
+    from plan_batch import generate_plan_batch
+
+    def cold(func):
+        """Wrap func so every run starts without the per-gateway analysis and chart caches."""
+        def run(*args):
+            plan_analysis.gateway_track_cache = {}
+            plan_analysis.gateway_chart_cache = {}
+            return func(*args)
+        return run
+
+    plan = generate_plan(args.gateways, args.tracks, args.satellites)
+    new_gateway = generate_plan(1, args.tracks, args.satellites, seed=5, day=datetime(2024, 3, 5))
+    xml = generate_xml(args.satellites // 10 or 1)
+    deploy_date = datetime(2024, 3, 10)
+    deploy_time = datetime(1900, 1, 1, 1, 0, 0)
+    print(f"Plan: {args.gateways} gateways x {args.tracks} tracks, {len(plan) / 1024:.0f} KB")
+
+    timings = []
+    seconds, df = best_of(args.repeat, lambda: parse_xml(BytesIO(xml.encode()), deploy_date))
+    timings.append(("parse_xml", seconds))
+    seconds, _ = best_of(args.repeat, build_txt, df, 'GS_BENCH', deploy_date, deploy_time)
+    timings.append(("build_txt", seconds))
+    seconds, _ = best_of(args.repeat, merge_plans, plan, new_gateway)
+    timings.append(("merge_plans", seconds))
+    seconds, (df, _) = best_of(args.repeat, cold(lambda: analyze_plan_txt_file(BytesIO(plan.encode()))))
+    timings.append(("analyze_plan_txt_file", seconds))
+    seconds, _ = best_of(args.repeat, cold(lambda: analyze_plan_txt_file(BytesIO(plan.encode()), deploy_date, deploy_time)))
+    timings.append(("analyze_plan_txt_file + re-date", seconds))
+    seconds, _ = best_of(args.repeat, flag_satellite_conflicts, df.copy())
+    timings.append(("flag_satellite_conflicts", seconds))
+    seconds, _ = best_of(args.repeat, cold(generate_gantt_multi_gateway), df)
+    timings.append(("generate_gantt_multi_gateway", seconds))
+    seconds, _ = best_of(args.repeat, lambda: list(generate_plan_batch(plan, deploy_date, deploy_date + timedelta(days=29), deploy_time)))
+    timings.append(("generate_plan_batch (30 days)", seconds))
+
+    for name, seconds in timings:
+        print(f"  {seconds * 1000:10.1f} ms  {name}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compression Module
+Streams gzip/zip uploads open without unpacking them to disk and gzips responses for clients that accept it.
+"""
+
+import gzip
+import os
+import zipfile
+import zlib
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+# Mimetypes that are already compressed or must reach the client unbuffered
+UNCOMPRESSED_MIMETYPES = {'text/event-stream', 'application/zip', 'application/gzip'}
+
+def is_accepted_upload(filename, extension):
+    """Check that an upload is an `extension` file, plain or gzip/zip compressed."""
+    return filename.lower().endswith((extension, '.gz', '.zip'))
+
+def upload_members(file_storage, extension):
+    """Return (name, stream) for every `extension` file in an upload.
+
+    Plain uploads are returned as-is, `.gz` uploads are wrapped in a streaming GzipFile
+    and `.zip` uploads yield one streaming member per matching file inside the archive.
+    """
+    filename = file_storage.filename.lower()
+    if filename.endswith(extension):
+        return [(file_storage.filename, file_storage.stream)]
+    if filename.endswith('.gz'):
+        return [(file_storage.filename[:-3], gzip.GzipFile(fileobj=file_storage.stream, mode='rb'))]
+    if filename.endswith('.zip'):
+        try:
+            archive = zipfile.ZipFile(file_storage.stream)
+        except zipfile.BadZipFile:
+            raise ValueError("Invalid zip archive")
+        members = [(info.filename, archive.open(info)) for info in archive.infolist()
+                   if not info.is_dir() and info.filename.lower().endswith(extension)]
+        if not members:
+            raise ValueError(f"Zip archive contains no {extension} files")
+        return members
+    raise ValueError(f"Wrong file type. Please upload a {extension.upper().lstrip('.')} file (optionally .gz or .zip).")
+
+def open_upload(file_storage, extension, preferred_name=None):
+    """Return a single decompressed stream from an upload.
+
+    When a zip holds several matching files, the one named after `preferred_name`
+    (e.g. the gateway) is used.
+    """
+    members = upload_members(file_storage, extension)
+    if len(members) == 1:
+        return members[0][1]
+    if preferred_name:
+        for name, stream in members:
+            if os.path.splitext(os.path.basename(name))[0] == preferred_name:
+                return stream
+    raise ValueError(f"Zip archive contains {len(members)} {extension} files; "
+                     f"name the one to use after the gateway (e.g. {preferred_name or 'GS_NAME'}{extension})")
+
+def read_upload_text(file_storage, extension):
+    """Read and decode a (possibly compressed) text upload."""
+    try:
+        return open_upload(file_storage, extension).read().decode('utf-8')
+    except (OSError, EOFError, zlib.error):
+        raise ValueError("Could not decompress uploaded file")
+
+def _gzip_stream(chunks):
+    """Gzip an iterable of response chunks incrementally."""
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def compress_response(request, response):
+    """Gzip a response in place when the client accepts it and it is worth it."""
+    if (request.method == 'HEAD'
+            or response.status_code != 200
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+            or 'Content-Encoding' in response.headers
+            or response.mimetype in UNCOMPRESSED_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if response.is_streamed and not response.direct_passthrough:
+        # Generators (e.g. streamed templates) are compressed chunk by chunk as they are produced
+        response.response = _gzip_stream(response.response)
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    # send_file responses pass their file straight through; buffer them so they can be compressed
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
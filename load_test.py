@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Load Test Module
+Drives the app with concurrent XML analysis, plan merge and plan analysis uploads plus their downloads.
+
+Usage:
+    python load_test.py [--concurrency 8] [--requests 64] [--url http://127.0.0.1:5000 --server-pid PID]
+
+Every upload carries a unique marker (its gateway name) and is immediately followed by its
+download, so a download that returns another request's plan, or that another request
+already consumed, is reported as cross-request contamination of the download buffers.
+"""
+
+import argparse
+import resource
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from benchmark import generate_xml, generate_plan
+
+SCENARIOS = ('xml_analysis', 'plan_merge', 'plan_analysis')
+DOWNLOAD_ROUTES = {
+    'xml_analysis': '/download_txt',
+    'plan_merge': '/download_merged',
+    'plan_analysis': '/download_updated_plan'
+}
+
+def read_rss_kb(pid='self'):
+    """Return (current RSS, peak RSS) in KB for a process, or (None, None) if unavailable."""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            fields = dict(line.split(':', 1) for line in status if ':' in line)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        if pid == 'self':
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return None, peak
+        return None, None
+
+def build_inputs(gateways, tracks, satellites):
+    """Generate the upload templates once; each request only swaps in its marker."""
+    return {
+        'xml': generate_xml(satellites=max(4, satellites // 10)).encode('utf-8'),
+        'plan': generate_plan(gateways, tracks, satellites),
+        'gateway': generate_plan(1, tracks, satellites, seed=5, day=datetime(2024, 3, 5))
+    }
+
+def build_request(scenario, inputs, marker):
+    """Return (form fields, files) for one upload tagged with `marker`."""
+    if scenario == 'xml_analysis':
+        fields = {'form_type': scenario, 'gateway': marker, 'Deploy_Date': '20240310', 'Deploy_Time': '01:00:00'}
+        return fields, {'file': ('schedule.xml', inputs['xml'])}
+    if scenario == 'plan_merge':
+        new_gateway = inputs['gateway'].replace('GS_GW00', marker)
+        return {'form_type': scenario}, {'old_plan': ('old_plan.txt', inputs['plan'].encode('utf-8')),
+                                         'new_gateway': ('new_gateway.txt', new_gateway.encode('utf-8'))}
+    plan = inputs['plan'].replace('GS_GW00', marker)
+    fields = {'form_type': scenario, 'Deploy_Date': '20240310', 'Deploy_Time': '01:00:00'}
+    return fields, {'full_plan': ('full_plan.txt', plan.encode('utf-8'))}
+
+class TestClientTransport:
+    """Sends requests through the Flask test client of an in-process app."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def post(self, fields, files):
+        data = dict(fields)
+        for name, (filename, content) in files.items():
+            data[name] = (BytesIO(content), filename)
+        response = self.client.post('/', data=data, content_type='multipart/form-data')
+        return response.status_code, response.get_data()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_data()
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+class HttpTransport:
+    """Sends requests to a running server over HTTP without following redirects."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(_NoRedirect)
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=300) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def post(self, fields, files):
+        boundary = uuid.uuid4().hex
+        parts = []
+        for name, value in fields.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+        for name, (filename, content) in files.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                         f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+        parts.append(f'--{boundary}--\r\n'.encode())
+        request = urllib.request.Request(self.base_url + '/', data=b''.join(parts), method='POST',
+                                         headers={'Content-Type': f'multipart/form-data; boundary={boundary}'})
+        return self._open(request)
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+def run_one(transport, scenario, inputs, results, lock):
+    """Upload, download and check one request; record latencies and outcome."""
+    marker = f"GS_LT{uuid.uuid4().hex[:10].upper()}"
+    fields, files = build_request(scenario, inputs, marker)
+
+    start = time.perf_counter()
+    status, _ = transport.post(fields, files)
+    upload_seconds = time.perf_counter() - start
+    upload_ok = status == 200
+
+    download_route = DOWNLOAD_ROUTES[scenario]
+    start = time.perf_counter()
+    download_status, body = transport.get(download_route) if upload_ok else (None, b'')
+    download_seconds = time.perf_counter() - start
+
+    outcome = 'error'
+    if upload_ok and download_status == 200:
+        outcome = 'ok' if marker.encode() in body else 'contaminated'
+    elif upload_ok and download_status in (301, 302, 303):
+        # The buffer was already consumed by (or replaced for) another request
+        outcome = 'stolen'
+
+    with lock:
+        results[scenario].append(upload_seconds)
+        if upload_ok:
+            results[download_route].append(download_seconds)
+        results['outcomes'][outcome] = results['outcomes'].get(outcome, 0) + 1
+        results['outcomes_by_scenario'].setdefault(scenario, {}).setdefault(outcome, 0)
+        results['outcomes_by_scenario'][scenario][outcome] += 1
+
+def new_results():
+    """Empty latency lists per route plus outcome counters."""
+    results = {route: [] for route in list(SCENARIOS) + list(DOWNLOAD_ROUTES.values())}
+    results['outcomes'] = {}
+    results['outcomes_by_scenario'] = {}
+    return results
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+def print_report(results, elapsed, total, rss_before, rss_after):
+    """Print throughput, latency percentiles, error/contamination counts and RSS growth."""
+    outcomes = results['outcomes']
+    print(f"Requests: {total} in {elapsed:.2f}s ({total / elapsed:.2f} upload+download pairs/s)")
+    print(f"{'Route':<24}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for route in list(SCENARIOS) + list(DOWNLOAD_ROUTES.values()):
+        values = results[route]
+        if not values:
+            continue
+        row = [percentile(values, p) * 1000 for p in (50, 90, 95, 99)] + [max(values) * 1000]
+        print(f"{route:<24}{len(values):>7}" + "".join(f"{v:>10.1f}" for v in row))
+
+    errors = outcomes.get('error', 0)
+    contaminated = outcomes.get('contaminated', 0) + outcomes.get('stolen', 0)
+    print(f"Errors: {errors} ({errors / total:.1%})")
+    print(f"Cross-request contamination: {contaminated} ({contaminated / total:.1%}) - "
+          f"{outcomes.get('contaminated', 0)} returned another request's file, "
+          f"{outcomes.get('stolen', 0)} found the file already downloaded")
+    for scenario, counts in sorted(results['outcomes_by_scenario'].items()):
+        print(f"  {scenario:<16} " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
+    if rss_before[0] is not None and rss_after[0] is not None:
+        print(f"RSS: {rss_before[0] / 1024:.1f} MB -> {rss_after[0] / 1024:.1f} MB "
+              f"(growth {(rss_after[0] - rss_before[0]) / 1024:+.1f} MB, peak {rss_after[1] / 1024:.1f} MB)")
+    elif rss_after[1] is not None:
+        print(f"Peak RSS: {rss_after[1] / 1024:.1f} MB")
+    else:
+        print("RSS: unavailable (pass --server-pid when testing a remote server)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the STP Track Tool.")
+    parser.add_argument('--concurrency', type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument('--requests', type=int, default=64, help="Total upload+download pairs")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="Comma-separated form types to exercise")
+    parser.add_argument('--url', help="Base URL of a running server (default: in-process Flask test client)")
+    parser.add_argument('--server-pid', help="PID of the server process, for RSS reporting with --url")
+    parser.add_argument('--gateways', type=int, default=5, help="Gateways per generated plan")
+    parser.add_argument('--tracks', type=int, default=50, help="Tracks per gateway")
+    parser.add_argument('--satellites', type=int, default=40)
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    inputs = build_inputs(args.gateways, args.tracks, args.satellites)
+    if args.url:
+        make_transport = lambda: HttpTransport(args.url)
+        rss_pid = args.server_pid
+    else:
+        from main import app
+        make_transport = lambda: TestClientTransport(app)
+        rss_pid = 'self'
+
+    lock = threading.Lock()
+    local = threading.local()
+
+    def job(i):
+        if not hasattr(local, 'transport'):
+            local.transport = make_transport()
+        run_one(local.transport, scenarios[i % len(scenarios)], inputs, results, lock)
+
+    # Warm up lazy imports and templates so they do not count as load
+    warmup_transport = make_transport()
+    for scenario in scenarios:
+        run_one(warmup_transport, scenario, inputs, new_results(), lock)
+    results = new_results()
+
+    rss_before = read_rss_kb(rss_pid) if rss_pid else (None, None)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(job, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    rss_after = read_rss_kb(rss_pid) if rss_pid else (None, None)
+
+    print(f"Concurrency: {args.concurrency}, scenarios: {', '.join(scenarios)}, "
+          f"target: {args.url or 'in-process test client'}")
+    print_report(results, elapsed, args.requests, rss_before, rss_after)
+
+if __name__ == '__main__':
+    main()
@@ -3,21 +3,40 @@ STPTrackTool - Main Flask Application
 Entry point for the satellite tracking tool web application.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 import os
 from xml_analysis import handle_xml_analysis, download_txt
-from plan_merge import handle_plan_merge, download_merged
-from plan_analysis import handle_plan_analysis, download_updated_plan
+from plan_merge import handle_plan_merge, download_merged, merged_preview
+from plan_analysis import handle_plan_analysis, download_updated_plan, gantt_detail
+from plan_repair import download_repaired_plan
+from plan_batch import handle_plan_batch
+from progress import stream_progress, stage_profiles
+from compression import compress_response
+from upload_limits import check_upload_limits, max_request_bytes, format_megabytes
 
 # Create Flask app instance
 app = Flask("STPTrackTool")
 app.secret_key = os.urandom(24)
 
+# Hard cap on request bodies; per-form limits are checked in index()
+app.config['MAX_CONTENT_LENGTH'] = max_request_bytes()
+
+@app.after_request
+def compress(response):
+    """Gzip pages and downloads for clients that accept it."""
+    return compress_response(request, response)
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """Main route handler that delegates to appropriate page handlers."""
     if request.method == 'POST':
         form_type = request.form.get('form_type')
+
+        # Reject oversized uploads before any handler starts parsing them
+        limit_error = check_upload_limits(form_type, request)
+        if limit_error:
+            flash(limit_error, "error")
+            return redirect(url_for('index'))
         
         if form_type == 'xml_analysis':
             return handle_xml_analysis(request)
@@ -25,9 +44,17 @@ def index():
             return handle_plan_merge(request)
         elif form_type == 'plan_analysis':
             return handle_plan_analysis(request)
+        elif form_type == 'plan_batch':
+            return handle_plan_batch(request)
     
     return render_template('index.html')
 
+@app.errorhandler(413)
+def upload_too_large(error):
+    """Redirect home with a message when a request exceeds the hard size cap."""
+    flash(f"Upload too large: limit is {format_megabytes(app.config['MAX_CONTENT_LENGTH'])}", "error")
+    return redirect(url_for('index'))
+
 @app.route('/download_txt')
 def download_txt_file():
     """Download generated TXT file from XML analysis."""
@@ -39,11 +66,41 @@ def download_merged_file():
     return download_merged()
 
 
+@app.route('/merged_preview')
+def merged_preview_page():
+    """Page through the merged plan by line range or gateway section."""
+    return merged_preview()
+
+
 @app.route('/download_updated_plan')
 def download_updated_plan_file():
     """Download updated plan file with new dates."""
     return download_updated_plan()
 
 
+@app.route('/download_repaired_plan')
+def download_repaired_plan_file():
+    """Download plan file with proposed gap repairs."""
+    return download_repaired_plan()
+
+
+@app.route('/gantt_detail')
+def gantt_detail_window():
+    """Full-detail Gantt tracks for a zoomed window of a large gateway."""
+    return gantt_detail()
+
+
+@app.route('/progress/<job_id>')
+def progress_events(job_id):
+    """Stream stage-level progress of an in-flight analysis as server-sent events."""
+    return stream_progress(job_id)
+
+
+@app.route('/profile')
+def profile():
+    """Stage timings (and memory peaks when STP_PROFILE_MEMORY=1) of recent requests."""
+    return jsonify(stage_profiles())
+
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -3,104 +3,209 @@ Plan Analysis Module
 Handles analysis and visualization of full satellite tracking plans.
 """
 
-from flask import render_template, request, flash, redirect, url_for, send_file
-import pandas as pd
+from flask import stream_template, request, flash, redirect, url_for, send_file, jsonify, Response
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
 from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import heapq
+import multiprocessing
+import os
+import threading
+import uuid
+from html import escape
+from compression import is_accepted_upload, open_upload
+from table_render import VIRTUAL_TABLE_THRESHOLD, build_table_payload, render_table_chunks
+from progress import request_job_id, start_progress, report_progress, finish_progress, release_progress, stream_with_progress
+from plan_repair import repair_plan_gaps, build_repair_report
+from plan_batch import build_redate_template
+from plan_merge import update_track_dates
 
 # Global memory buffer for updated plan download
 stored_updated_plan = BytesIO()
 download_used = {'plan': False}
 
+# Recently analyzed plans by analysis id, used to serve full-detail Gantt windows on zoom
+PLAN_DETAIL_HISTORY = 8
+stored_plan_dfs = OrderedDict()
+stored_plan_lock = threading.Lock()
+
+# Gateways with more satellites than this get a binned coverage overview instead of full-detail bars
+LOD_SATELLITE_THRESHOLD = 100
+# Maximum number of track bars returned for one zoomed detail window
+LOD_MAX_DETAIL_TRACKS = 2000
+
+# Maximum number of conflicting track pairs listed in the summary
+CONFLICT_REPORT_LIMIT = 100
+
+# Plans with at least this many lines/tracks shard per-gateway work across a process pool
+PARALLEL_TRACK_THRESHOLD = 5000
+PARALLEL_MAX_WORKERS = os.cpu_count() or 1
+
+# Workers start from a clean server process (or interpreter) rather than a fork of the threaded
+# server, which could copy a lock held by another request thread into them
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Process pool shared by all requests, created on first use
+process_pool = None
+process_pool_lock = threading.Lock()
+
+# Per-gateway results of the last analysis, reused for gateways whose tracks are unchanged
+gateway_track_cache = {}
+gateway_chart_cache = {}
+
+def get_process_pool():
+    """Return the shared process pool, creating it on first use."""
+    global process_pool
+    with process_pool_lock:
+        if process_pool is None:
+            process_pool = ProcessPoolExecutor(max_workers=PARALLEL_MAX_WORKERS,
+                                               mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        return process_pool
+
+def iter_per_gateway(func, jobs, work_size):
+    """Run func(*job) for every per-gateway job, yielding the results in job order as they finish.
+
+    Small inputs stay in-process; large multi-gateway inputs are sharded across the
+    shared process pool. Results always come back in the original gateway order.
+    """
+    global process_pool
+    if work_size < PARALLEL_TRACK_THRESHOLD or len(jobs) < 2 or PARALLEL_MAX_WORKERS < 2:
+        for job in jobs:
+            yield func(*job)
+        return
+
+    pool = get_process_pool()
+    finished = 0
+    try:
+        for result in pool.map(func, *zip(*jobs)):
+            finished += 1
+            yield result
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time and finish in-process
+        with process_pool_lock:
+            if process_pool is pool:
+                process_pool = None
+        for job in jobs[finished:]:
+            yield func(*job)
+
+def map_per_gateway(func, jobs, work_size):
+    """Run func(*job) for every per-gateway job and return the results in job order."""
+    return list(iter_per_gateway(func, jobs, work_size))
+
 # --- [Function: update_plan_dates_new] ---
 def update_plan_dates_new(file_content, new_deploy_date, new_deploy_time):
     """Update plan dates similar to XML analysis - preserve times, update dates."""
-    lines = file_content.strip().split('\n')
-    if len(lines) < 3:
-        raise ValueError("Invalid plan file format")
-
     # Parse deploy datetime
     new_deploy_datetime = datetime.combine(new_deploy_date.date(), new_deploy_time.time())
     new_deploy_str = new_deploy_datetime.strftime("%Y%m%d%H%M%S.000")
-    
-    # Find gateway section and collect all tracks
-    gateway_start = next((i for i, line in enumerate(lines) if line.startswith('GS_')), None)
-    if gateway_start is None:
-        raise ValueError("No gateway lines found")
-    
+
+    # The plan body is parsed once into a template and every date is filled in by a single format call
+    template, first_start_time = build_redate_template(file_content)
+    new_epoch_millis = int(datetime.combine(new_deploy_date.date(), first_start_time).timestamp() * 1000)
+
+    day_str = new_deploy_date.strftime("%Y%m%d")
+    next_day_str = (new_deploy_date + timedelta(days=1)).strftime("%Y%m%d")
+    return f"{new_epoch_millis}\n{new_deploy_str}\n" + template.format(day_str, next_day_str)
+
+# --- [Function: analyze_gateway_lines] ---
+def analyze_gateway_lines(gateway, lines):
+    """Parse one gateway's track lines, sort them and flag SHORT/LONG/NO OVERLAP tracks."""
     tracks = []
-    current_gateway = None
-    
-    for line in lines[gateway_start:]:
-        line = line.strip()
-        if line.startswith('GS_'):
-            current_gateway = line
-            continue
-        
+    for line in lines:
         parts = line.split()
         if len(parts) >= 5 and parts[1] == 'DAT' and parts[2] == 'RECUR':
             try:
-                original_start = datetime.strptime(parts[3].split('.')[0], "%Y%m%d%H%M%S")
-                original_end = datetime.strptime(parts[4].split('.')[0], "%Y%m%d%H%M%S")
-                
-                # Extract time components
-                start_time = original_start.time()
-                end_time = original_end.time()
-                
-                # Create new datetime with deploy date but original times
-                new_start = datetime.combine(new_deploy_date.date(), start_time)
-                
-                # Handle end time - if end time is earlier than start time, it's next day
-                if end_time < start_time:
-                    new_end = datetime.combine(new_deploy_date.date() + timedelta(days=1), end_time)
-                else:
-                    new_end = datetime.combine(new_deploy_date.date(), end_time)
-                
-                tracks.append({
-                    'gateway': current_gateway,
-                    'satellite': parts[0],
-                    'data': parts[1],
-                    'recur': parts[2],
-                    'start': new_start,
-                    'end': new_end,
-                    'original_line': line
-                })
-            except Exception:
-                # Keep non-track lines as is
-                tracks.append({
-                    'gateway': current_gateway,
-                    'original_line': line,
-                    'is_track': False
-                })
-    
-    if not any(t.get('start') for t in tracks):
-        raise ValueError("No valid tracks found for date update")
-    
-    # Find first track time for new epoch
-    first_track_time = min(t['start'] for t in tracks if t.get('start'))
-    new_epoch_millis = int(first_track_time.timestamp() * 1000)
-    
-    # Build updated content
-    updated_lines = [str(new_epoch_millis), new_deploy_str]
-    
-    current_gateway = None
-    for track in tracks:
-        if track['gateway'] != current_gateway:
-            current_gateway = track['gateway']
-            updated_lines.append(current_gateway)
-        
-        if track.get('start'):  # It's a track line
-            start_str = track['start'].strftime("%Y%m%d%H%M%S.000")
-            end_str = track['end'].strftime("%Y%m%d%H%M%S.000")
-            updated_lines.append(f"{track['satellite']} {track['data']} {track['recur']} {start_str} {end_str}")
-        else:  # Non-track line
-            updated_lines.append(track['original_line'])
-    
-    return '\n'.join(updated_lines)
+                start = datetime.strptime(parts[3].split('.')[0], "%Y%m%d%H%M%S")
+                end = datetime.strptime(parts[4].split('.')[0], "%Y%m%d%H%M%S")
+                duration = (end - start).total_seconds() / 60.0
+                if duration < 0:
+                    duration += 1440
+                flags = []
+                if duration < 24: flags.append("SHORT")
+                if duration > 45: flags.append("LONG")
+                tracks.append([gateway, parts[0], start, end, duration, ", ".join(flags) or "OK"])
+            except: continue
+
+    tracks.sort(key=lambda x: x[2])
+    for i in range(len(tracks)):
+        overlaps_prev = i == 0 or tracks[i][2] <= tracks[i-1][3]
+        overlaps_next = i == len(tracks)-1 or tracks[i][3] >= tracks[i+1][2]
+        if not (overlaps_prev and overlaps_next):
+            flags = tracks[i][5].split(', ') if tracks[i][5] != "OK" else []
+            if "NO OVERLAP" not in flags:
+                flags.append("NO OVERLAP")
+                tracks[i][5] = ", ".join(sorted(set(flags)))
+    return tracks
+
+def is_track_line(line):
+    """Check whether a plan line has the shape of a track line."""
+    parts = line.split()
+    return len(parts) >= 5 and parts[1] == 'DAT' and parts[2] == 'RECUR'
+
+def reuse_gateway_tracks(gateway, lines):
+    """Return the cached analysis of a gateway if its lines are unchanged or only re-dated.
+
+    Merging re-dates every other gateway to the new plan day with update_track_dates. For
+    a gateway whose tracks all start on one day and end that day or the next, that is a
+    uniform shift: durations, order and flags are unchanged and only the dates move.
+    Returns None when the gateway has to be analyzed again.
+    """
+    cached = gateway_track_cache.get(gateway)
+    if cached is None:
+        return None
+    cached_lines, tracks = cached
+    if lines == cached_lines:
+        return tracks
+    if not tracks:
+        return None
+
+    new_date_str = next((line.split()[3][:8] for line in lines if len(line.split()) >= 5), None)
+    try:
+        new_date = datetime.strptime(new_date_str or '', "%Y%m%d")
+        if update_track_dates(cached_lines, new_date_str) != lines:
+            return None
+    except ValueError:
+        return None
+
+    day = tracks[0][2].date()
+    if any(track[2].date() != day or (track[3].date() - day).days not in (0, 1) for track in tracks):
+        return None
+    # A track line that failed to parse could become valid once re-dated
+    if len(tracks) != sum(1 for line in cached_lines if is_track_line(line)):
+        return None
+
+    shift = new_date.date() - day
+    return [[g, satellite, start + shift, end + shift, duration, flag]
+            for g, satellite, start, end, duration, flag in tracks]
+
+def analyze_gateways(gateway_lines):
+    """Analyze every gateway's lines, reusing cached results where possible.
+
+    Returns the tracks per gateway in gateway order and the number of gateways reused.
+    """
+    global gateway_track_cache
+    results = {}
+    jobs = []
+    for gateway, lines in gateway_lines.items():
+        tracks = reuse_gateway_tracks(gateway, lines)
+        if tracks is None:
+            jobs.append((gateway, lines))
+        else:
+            results[gateway] = tracks
+
+    work_size = sum(len(lines) for _, lines in jobs)
+    for (gateway, _), tracks in zip(jobs, map_per_gateway(analyze_gateway_lines, jobs, work_size)):
+        results[gateway] = tracks
+
+    # Only the latest plan is kept, so the cache never holds more than one plan
+    gateway_track_cache = {gateway: (lines, results[gateway]) for gateway, lines in gateway_lines.items()}
+    return [results[gateway] for gateway in gateway_lines], len(gateway_lines) - len(jobs)
 
 # --- [Function: analyze_plan_txt_file] ---
 def analyze_plan_txt_file(file_obj, new_deploy_date=None, new_deploy_time=None):
+    import pandas as pd
     try:
         file_obj.seek(0)
         try:
@@ -130,210 +235,430 @@ def analyze_plan_txt_file(file_obj, new_deploy_date=None, new_deploy_time=None):
         if gateway_start is None:
             raise ValueError("No gateway lines found")
 
-        gateway_data = {}
+        # Split the plan into per-gateway line lists; parsing and flagging is done per gateway
+        gateway_lines = {}
         current_gateway = None
         for line in lines[gateway_start:]:
             if line.startswith('GS_'):
                 current_gateway = line
-                gateway_data[current_gateway] = []
+                gateway_lines[current_gateway] = []
                 continue
-            parts = line.split()
-            if len(parts) >= 5 and parts[1] == 'DAT' and parts[2] == 'RECUR':
-                try:
-                    start = datetime.strptime(parts[3].split('.')[0], "%Y%m%d%H%M%S")
-                    end = datetime.strptime(parts[4].split('.')[0], "%Y%m%d%H%M%S")
-                    duration = (end - start).total_seconds() / 60.0
-                    if duration < 0:
-                        duration += 1440
-                    flags = []
-                    if duration < 24: flags.append("SHORT")
-                    if duration > 45: flags.append("LONG")
-                    gateway_data[current_gateway].append([current_gateway, parts[0], start, end, duration, ", ".join(flags) or "OK"])
-                except: continue
+            gateway_lines[current_gateway].append(line)
 
         all_data = []
-        for gateway, tracks in gateway_data.items():
-            tracks.sort(key=lambda x: x[2])
-            for i in range(len(tracks)):
-                overlaps_prev = i == 0 or tracks[i][2] <= tracks[i-1][3]
-                overlaps_next = i == len(tracks)-1 or tracks[i][3] >= tracks[i+1][2]
-                if not (overlaps_prev and overlaps_next):
-                    flags = tracks[i][5].split(', ') if tracks[i][5] != "OK" else []
-                    if "NO OVERLAP" not in flags:
-                        flags.append("NO OVERLAP")
-                        tracks[i][5] = ", ".join(sorted(set(flags)))
+        gateway_tracks, gateways_reused = analyze_gateways(gateway_lines)
+        for tracks in gateway_tracks:
             all_data.extend(tracks)
 
         if not all_data:
             raise ValueError("No valid tracks found")
 
         df = pd.DataFrame(all_data, columns=["Gateway", "Satellite", "Start", "End", "Duration", "Flag"])
-        return df.sort_values("Start").reset_index(drop=True), dates_updated
+        df = df.sort_values("Start").reset_index(drop=True)
+        df.attrs['gateways_reused'] = gateways_reused
+        if dates_updated:
+            # Callers needing the re-dated text read it from here; the download buffer may be replaced concurrently
+            df.attrs['updated_plan'] = content
+        return df, dates_updated
     except Exception as e:
         raise ValueError(f"Error processing plan: {str(e)}")
 
-def generate_gantt_multi_gateway(df):
-    gateways = df['Gateway'].unique()
-    
-    # Create separate figures for each gateway
-    gateway_figures = {}
-    
+# --- [Function: flag_satellite_conflicts] ---
+def flag_satellite_conflicts(df):
+    """Flag tracks where one satellite is scheduled on two gateways at overlapping times.
+
+    Tracks are regrouped by satellite with a single sort and swept in start order while a
+    heap keeps the still-active tracks, so the pass is O(n log n) plus the conflicts found.
+    Adds CONFLICT to the Flag column in place and returns the list of conflicting pairs.
+    """
+    import numpy as np
+    import pandas as pd
+    if df.empty:
+        return []
+
+    satellite_codes, _ = pd.factorize(df['Satellite'])
+    starts = df['Start'].to_numpy()
+    ends = df['End'].to_numpy()
+    gateways = df['Gateway'].to_numpy()
+    order = np.lexsort((starts, satellite_codes))
+
+    conflicts = []
+    conflicted = set()
+    active = []
+    current_satellite = None
+    for idx in order:
+        if satellite_codes[idx] != current_satellite:
+            current_satellite = satellite_codes[idx]
+            active = []
+        # Drop tracks of this satellite that ended before this one starts
+        while active and active[0][0] <= starts[idx]:
+            heapq.heappop(active)
+        for other_end, other_idx in active:
+            if gateways[other_idx] != gateways[idx]:
+                conflicted.update((idx, other_idx))
+                conflicts.append({
+                    'satellite': df.at[idx, 'Satellite'],
+                    'gateway_a': gateways[other_idx],
+                    'gateway_b': gateways[idx],
+                    'start': pd.Timestamp(starts[idx]),
+                    'end': pd.Timestamp(min(ends[idx], other_end)),
+                })
+        heapq.heappush(active, (ends[idx], idx))
+
+    for idx in conflicted:
+        flags = df.at[idx, 'Flag'].split(', ') if df.at[idx, 'Flag'] != "OK" else []
+        flags.append("CONFLICT")
+        df.at[idx, 'Flag'] = ", ".join(sorted(set(flags)))
+
+    return conflicts
+
+def build_gateway_chart(gateway, gateway_df, include_plotlyjs=True):
+    """Build the Gantt chart for one gateway; returns (chart HTML, whether it is a level-of-detail overview)."""
+    import plotly.graph_objects as go
     flag_colors = {
         'OK': '#2ca02c',      # Green
         'SHORT': '#ff7f0e',   # Orange  
         'LONG': '#1f77b4',    # Blue
-        'NO OVERLAP': '#d62728'  # Red
+        'NO OVERLAP': '#d62728',  # Red
+        'CONFLICT': '#9467bd'  # Purple
     }
 
-    for gateway in gateways:
-        gateway_df = df[df['Gateway'] == gateway].copy()
-        unique_satellites = gateway_df['Satellite'].unique()
-        
-        fig = go.Figure()
-        legend_added = set()
-        
-        satellite_to_y = {sat: i for i, sat in enumerate(unique_satellites)}
-        
-        # Find the maximum end time for this gateway to set x-axis range
-        max_end_time = 0
-        for _, entry in gateway_df.iterrows():
-            end_hour = entry['End'].hour + entry['End'].minute/60 + entry['End'].second/3600
-            start_hour = entry['Start'].hour + entry['Start'].minute/60 + entry['Start'].second/3600
-            if end_hour < start_hour:
-                end_hour += 24
-            max_end_time = max(max_end_time, end_hour)
-        
-        for _, entry in gateway_df.iterrows():
-            satellite = entry['Satellite']
-            flags = entry['Flag'].split(', ') if entry['Flag'] != 'OK' else ['OK']
-            
-            # Determine color and pattern based on flags
-            if len(flags) == 1 and flags[0] == 'OK':
-                color = flag_colors['OK']
-                pattern = None
-                legend_name = 'OK'
-            elif len(flags) == 1:
-                color = flag_colors.get(flags[0], '#gray')
-                pattern = None
-                legend_name = flags[0]
-            else:
-                # Multiple flags - create alternating stripes
-                primary_flag = [f for f in flags if f != 'OK'][0] if any(f != 'OK' for f in flags) else flags[0]
-                secondary_flag = [f for f in flags if f != 'OK' and f != primary_flag]
-                secondary_flag = secondary_flag[0] if secondary_flag else 'OK'
-                
-                color = flag_colors.get(primary_flag, '#gray')
-                legend_name = f"{primary_flag} + {secondary_flag}"
-            
-            # Convert times to hour format for proper x-axis alignment
-            start_hour = entry['Start'].hour + entry['Start'].minute/60 + entry['Start'].second/3600
-            end_hour = entry['End'].hour + entry['End'].minute/60 + entry['End'].second/3600
-            
-            # Handle case where end time is next day
-            if end_hour < start_hour:
-                end_hour += 24
-            
-            # Use the fixed y-position for this satellite
-            y_position = satellite_to_y[satellite]
-            
-            # Add rectangle shape for the time bar
-            fig.add_shape(
-                type="rect",
-                x0=start_hour,
-                y0=y_position - 0.4,  
-                x1=end_hour,
-                y1=y_position + 0.4,
-                fillcolor=color,
-                line=dict(color='black', width=1),
-                layer="above"  
-            )
-            
-            # Add invisible scatter trace for hover and legend
-            showlegend = legend_name not in legend_added
-            if showlegend:
-                legend_added.add(legend_name)
-            
-            fig.add_trace(go.Scatter(
-                x=[start_hour + (end_hour - start_hour)/2], 
-                y=[y_position],
-                mode='markers',
-                marker=dict(
-                    color=color,
-                    size=10,
-                    opacity=0  
-                ),
-                name=legend_name,
-                hovertemplate=(
-                    f"<b>{satellite}</b><br>" +
-                    f"Start: {entry['Start'].strftime('%H:%M:%S')}<br>" +
-                    f"End: {entry['End'].strftime('%H:%M:%S')}<br>" +
-                    f"Duration: {entry['Duration']:.1f} min<br>" +
-                    f"Flags: {entry['Flag']}<br>" +
-                    "<extra></extra>"
-                ),
-                showlegend=showlegend
-            ))
-        
-        # Update layout for this gateway's figure
-        fig.update_layout(
-            title=f"Satellite Coverage Timeline - {gateway}",
-            xaxis_title="Time (Hours)",
-            yaxis_title="Satellites",
-            height=max(500, len(unique_satellites) * 60),  
-            width=1200,  
-            margin=dict(t=60, l=120, r=150, b=60), 
-            yaxis=dict(
-                tickmode='array',
-                tickvals=list(range(len(unique_satellites))),
-                ticktext=unique_satellites,
-                type='linear',
-                range=[-0.5, len(unique_satellites) - 0.5],
-                automargin=True,
-                showgrid=False,  
-                showline=False,  
-                zeroline=False  
-            ),
-            xaxis=dict(
-                range=[0, max_end_time * 1.02],  
-                tickmode='linear',
-                tick0=0,
-                dtick=1,
-                tickformat='%H:%M', 
-                title="Time (24-hour format)",
-                showgrid=True,  
-                gridcolor='white',  
-                gridwidth=1,
-                showline=False,  
-                zeroline=False  
+    unique_satellites = gateway_df['Satellite'].unique()
+
+    # Large constellations get a pre-aggregated overview; detail bars are fetched on zoom
+    if len(unique_satellites) > LOD_SATELLITE_THRESHOLD:
+        fig = create_coverage_overview(gateway, gateway_df, unique_satellites)
+        return _chart_html(gateway, fig, include_plotlyjs), True
+
+    fig = go.Figure()
+    legend_added = set()
+
+    satellite_to_y = {sat: i for i, sat in enumerate(unique_satellites)}
+
+    # Find the maximum end time for this gateway to set x-axis range
+    max_end_time = 0
+    for _, entry in gateway_df.iterrows():
+        end_hour = entry['End'].hour + entry['End'].minute/60 + entry['End'].second/3600
+        start_hour = entry['Start'].hour + entry['Start'].minute/60 + entry['Start'].second/3600
+        if end_hour < start_hour:
+            end_hour += 24
+        max_end_time = max(max_end_time, end_hour)
+
+    for _, entry in gateway_df.iterrows():
+        satellite = entry['Satellite']
+        flags = entry['Flag'].split(', ') if entry['Flag'] != 'OK' else ['OK']
+
+        # Determine color and pattern based on flags
+        if len(flags) == 1 and flags[0] == 'OK':
+            color = flag_colors['OK']
+            pattern = None
+            legend_name = 'OK'
+        elif len(flags) == 1:
+            color = flag_colors.get(flags[0], '#gray')
+            pattern = None
+            legend_name = flags[0]
+        else:
+            # Multiple flags - create alternating stripes
+            primary_flag = [f for f in flags if f != 'OK'][0] if any(f != 'OK' for f in flags) else flags[0]
+            secondary_flag = [f for f in flags if f != 'OK' and f != primary_flag]
+            secondary_flag = secondary_flag[0] if secondary_flag else 'OK'
+
+            color = flag_colors.get(primary_flag, '#gray')
+            legend_name = f"{primary_flag} + {secondary_flag}"
+
+        # Convert times to hour format for proper x-axis alignment
+        start_hour = entry['Start'].hour + entry['Start'].minute/60 + entry['Start'].second/3600
+        end_hour = entry['End'].hour + entry['End'].minute/60 + entry['End'].second/3600
+
+        # Handle case where end time is next day
+        if end_hour < start_hour:
+            end_hour += 24
+
+        # Use the fixed y-position for this satellite
+        y_position = satellite_to_y[satellite]
+
+        # Add rectangle shape for the time bar
+        fig.add_shape(
+            type="rect",
+            x0=start_hour,
+            y0=y_position - 0.4,  
+            x1=end_hour,
+            y1=y_position + 0.4,
+            fillcolor=color,
+            line=dict(color='black', width=1),
+            layer="above"  
+        )
+
+        # Add invisible scatter trace for hover and legend
+        showlegend = legend_name not in legend_added
+        if showlegend:
+            legend_added.add(legend_name)
+
+        fig.add_trace(go.Scatter(
+            x=[start_hour + (end_hour - start_hour)/2], 
+            y=[y_position],
+            mode='markers',
+            marker=dict(
+                color=color,
+                size=10,
+                opacity=0  
             ),
-            legend=dict(
-                orientation="v",
-                yanchor="top",
-                y=1,
-                xanchor="left",
-                x=1.02,
-                bgcolor="rgba(255,255,255,0.8)",
-                bordercolor="Black",
-                borderwidth=1
+            name=legend_name,
+            hovertemplate=(
+                f"<b>{satellite}</b><br>" +
+                f"Start: {entry['Start'].strftime('%H:%M:%S')}<br>" +
+                f"End: {entry['End'].strftime('%H:%M:%S')}<br>" +
+                f"Duration: {entry['Duration']:.1f} min<br>" +
+                f"Flags: {entry['Flag']}<br>" +
+                "<extra></extra>"
             ),
-            plot_bgcolor='#f0f0f0'  
-        )
-        
-        gateway_figures[gateway] = fig
-    
+            showlegend=showlegend
+        ))
+
+    # Update layout for this gateway's figure
+    fig.update_layout(
+        title=f"Satellite Coverage Timeline - {gateway}",
+        xaxis_title="Time (Hours)",
+        yaxis_title="Satellites",
+        height=max(500, len(unique_satellites) * 60),  
+        width=1200,  
+        margin=dict(t=60, l=120, r=150, b=60), 
+        yaxis=dict(
+            tickmode='array',
+            tickvals=list(range(len(unique_satellites))),
+            ticktext=unique_satellites,
+            type='linear',
+            range=[-0.5, len(unique_satellites) - 0.5],
+            automargin=True,
+            showgrid=False,  
+            showline=False,  
+            zeroline=False  
+        ),
+        xaxis=dict(
+            range=[0, max_end_time * 1.02],  
+            tickmode='linear',
+            tick0=0,
+            dtick=1,
+            tickformat='%H:%M', 
+            title="Time (24-hour format)",
+            showgrid=True,  
+            gridcolor='white',  
+            gridwidth=1,
+            showline=False,  
+            zeroline=False  
+        ),
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02,
+            bgcolor="rgba(255,255,255,0.8)",
+            bordercolor="Black",
+            borderwidth=1
+        ),
+        plot_bgcolor='#f0f0f0'  
+    )
+
+    return _chart_html(gateway, fig, include_plotlyjs), False
+
+def _chart_id(gateway):
+    """Element id of a gateway's chart div."""
+    return f"chart_{gateway.replace(' ', '_')}"
+
+def _chart_html(gateway, fig, include_plotlyjs):
+    """Render a gateway figure to HTML."""
+    return fig.to_html(full_html=False, div_id=_chart_id(gateway), include_plotlyjs=include_plotlyjs)
+
+def _chart_tab_html(gateway, chart_html, lod, analysis_id):
+    """Return tab HTML for a chart, wrapping level-of-detail overviews for zooming into this analysis."""
+    if not lod:
+        return chart_html
+    return (
+        f'<div class="lod-chart" data-gateway="{escape(gateway)}" data-analysis-id="{escape(analysis_id)}" '
+        f'data-chart-id="{escape(_chart_id(gateway))}">'
+        f'{chart_html}'
+        '<p class="form-text lod-hint">Overview shows coverage minutes per satellite per hour. '
+        'Zoom into a time/satellite window to load full-detail tracks.</p>'
+        '<div class="lod-detail"></div>'
+        '</div>'
+    )
+
+def chart_cache_key(gateway_df, include_plotlyjs):
+    """Key of everything a gateway chart is drawn from, so unchanged charts can be reused."""
+    start_hours, end_hours = _track_hours(gateway_df)
+    return (include_plotlyjs, tuple(gateway_df['Satellite']), start_hours.tobytes(), end_hours.tobytes(),
+            gateway_df['Duration'].to_numpy().tobytes(), tuple(gateway_df['Flag']))
+
+def generate_gantt_multi_gateway(df, on_gateway=None, analysis_id=''):
+    global gateway_chart_cache
+    gateway_groups = dict(tuple(df.groupby('Gateway', sort=False)))
+    gateways = list(gateway_groups)
+
+    # plotly.js only needs to be embedded once per page, in the first tab
+    keys = {gateway: chart_cache_key(gateway_groups[gateway], i == 0) for i, gateway in enumerate(gateways)}
+
+    # Charts drawn from the same tracks and flags as last time (times of day only) are reused
+    contents = {gateway: gateway_chart_cache[gateway][1] for gateway in gateways
+                if gateway in gateway_chart_cache and gateway_chart_cache[gateway][0] == keys[gateway]}
+    jobs = [(gateway, gateway_groups[gateway].copy(), i == 0) for i, gateway in enumerate(gateways)
+            if gateway not in contents]
+    rebuilt = [job[0] for job in jobs]
+    if on_gateway and contents:
+        on_gateway(len(contents), len(gateways))
+    # Report every chart as soon as it is built rather than once all of them are
+    for gateway, chart in zip(rebuilt, iter_per_gateway(build_gateway_chart, jobs, sum(len(job[1]) for job in jobs))):
+        contents[gateway] = chart
+        if on_gateway:
+            on_gateway(len(contents), len(gateways))
+
     # Create tabs structure
-    tabs = []
-    for gateway, fig in gateway_figures.items():
-        tab_content = fig.to_html(full_html=False, div_id=f"chart_{gateway.replace(' ', '_')}")
-        tabs.append({
-            'label': gateway,
-            'content': tab_content  
-        })
-    
+    tabs = [{
+        'label': gateway,
+        'content': _chart_tab_html(gateway, *contents[gateway], analysis_id),
+        'cached': gateway not in rebuilt
+    } for gateway in gateways]
+
+    gateway_chart_cache = {gateway: (keys[gateway], contents[gateway]) for gateway in gateways}
     return tabs
 
+def _track_hours(gateway_df):
+    """Return start/end positions in hours of day, with next-day ends pushed past 24."""
+    import numpy as np
+    start_hours = (gateway_df['Start'].dt.hour + gateway_df['Start'].dt.minute / 60
+                   + gateway_df['Start'].dt.second / 3600).to_numpy()
+    end_hours = (gateway_df['End'].dt.hour + gateway_df['End'].dt.minute / 60
+                 + gateway_df['End'].dt.second / 3600).to_numpy()
+    end_hours = np.where(end_hours < start_hours, end_hours + 24, end_hours)
+    return start_hours, end_hours
+
+def create_coverage_overview(gateway, gateway_df, unique_satellites):
+    """Create a per-satellite, per-hour coverage heatmap for a large constellation."""
+    import numpy as np
+    import plotly.graph_objects as go
+    start_hours, end_hours = _track_hours(gateway_df)
+    satellite_to_y = {sat: i for i, sat in enumerate(unique_satellites)}
+    sat_idx = gateway_df['Satellite'].map(satellite_to_y).to_numpy()
+    flagged = (gateway_df['Flag'] != 'OK').to_numpy()
+
+    hour_count = max(24, int(np.ceil(end_hours.max())))
+    coverage = np.zeros((len(unique_satellites), hour_count))
+    flagged_counts = np.zeros((len(unique_satellites), hour_count), dtype=int)
+
+    # Accumulate covered minutes of every track into the hour bins it spans
+    for hour in range(hour_count):
+        minutes = np.clip(np.minimum(end_hours, hour + 1) - np.maximum(start_hours, hour), 0, None) * 60
+        in_bin = minutes > 0
+        np.add.at(coverage[:, hour], sat_idx[in_bin], minutes[in_bin])
+        np.add.at(flagged_counts[:, hour], sat_idx[in_bin & flagged], 1)
+
+    fig = go.Figure(go.Heatmap(
+        z=coverage.round(1),
+        x=[hour + 0.5 for hour in range(hour_count)],
+        y=list(unique_satellites),
+        customdata=flagged_counts,
+        colorscale='Greens',
+        zmin=0,
+        zmax=60,
+        colorbar=dict(title='Minutes'),
+        hovertemplate=(
+            "<b>%{y}</b><br>" +
+            "Hour: %{x:.0f}<br>" +
+            "Coverage: %{z} min<br>" +
+            "Flagged tracks: %{customdata}<br>" +
+            "<extra></extra>"
+        )
+    ))
+
+    fig.update_layout(
+        title=f"Satellite Coverage Overview - {gateway} ({len(unique_satellites)} satellites)",
+        xaxis_title="Time (Hours)",
+        yaxis_title="Satellites",
+        height=min(2400, max(500, len(unique_satellites) * 8)),
+        width=1200,
+        margin=dict(t=60, l=120, r=150, b=60),
+        xaxis=dict(range=[0, hour_count], tickmode='linear', tick0=0, dtick=1, title="Time (24-hour format)"),
+        yaxis=dict(automargin=True),
+        plot_bgcolor='#f0f0f0'
+    )
+
+    return fig
+
+def gantt_detail():
+    """Return full-detail track bars for a zoomed time/satellite window of one gateway."""
+    import numpy as np
+    analysis_id = request.args.get('analysis', '')
+    with stored_plan_lock:
+        plan_df = stored_plan_dfs.get(analysis_id)
+        if plan_df is not None:
+            stored_plan_dfs.move_to_end(analysis_id)
+    if plan_df is None:
+        return jsonify({'error': 'This analysis is no longer available; analyze the plan again'}), 404
+
+    gateway = request.args.get('gateway', '')
+    gateway_df = plan_df[plan_df['Gateway'] == gateway]
+    if gateway_df.empty:
+        return jsonify({'error': f'Unknown gateway {gateway}'}), 404
+
+    try:
+        x0 = float(request.args.get('x0', 0))
+        x1 = float(request.args.get('x1', 48))
+        y0 = float(request.args.get('y0', 0))
+        y1 = float(request.args.get('y1', len(gateway_df)))
+    except ValueError:
+        return jsonify({'error': 'Invalid window bounds'}), 400
+
+    # Satellite rows use the same order as the overview heatmap
+    unique_satellites = gateway_df['Satellite'].unique()
+    first_row = max(0, int(np.ceil(min(y0, y1))))
+    last_row = min(len(unique_satellites) - 1, int(np.floor(max(y0, y1))))
+    window_satellites = list(unique_satellites[first_row:last_row + 1])
+
+    start_hours, end_hours = _track_hours(gateway_df)
+    in_window = (gateway_df['Satellite'].isin(window_satellites).to_numpy()
+                 & (end_hours >= min(x0, x1)) & (start_hours <= max(x0, x1)))
+    window_df = gateway_df[in_window]
+    truncated = len(window_df) > LOD_MAX_DETAIL_TRACKS
+    window_df = window_df.iloc[:LOD_MAX_DETAIL_TRACKS]
+
+    tracks = [{
+        'satellite': entry.Satellite,
+        'start_hour': round(float(start), 4),
+        'end_hour': round(float(end), 4),
+        'start': entry.Start.strftime('%H:%M:%S'),
+        'end': entry.End.strftime('%H:%M:%S'),
+        'duration': round(float(entry.Duration), 1),
+        'flag': entry.Flag
+    } for entry, start, end in zip(window_df.itertuples(index=False), start_hours[in_window], end_hours[in_window])]
+
+    return jsonify({
+        'gateway': gateway,
+        'satellites': window_satellites,
+        'tracks': tracks,
+        'truncated': truncated
+    })
+
+def build_conflict_report(conflicts, limit=CONFLICT_REPORT_LIMIT):
+    """Build the HTML conflict report shown under the summary."""
+    rows = "".join(
+        f"<tr><td>{escape(str(c['satellite']))}</td><td>{escape(str(c['gateway_a']))}</td><td>{escape(str(c['gateway_b']))}</td>"
+        f"<td>{c['start'].strftime('%Y-%m-%d %H:%M:%S')}</td><td>{c['end'].strftime('%Y-%m-%d %H:%M:%S')}</td>"
+        f"<td>{(c['end'] - c['start']).total_seconds() / 60:.1f}</td></tr>"
+        for c in conflicts[:limit]
+    )
+    more = f"<br>... {len(conflicts) - limit} more conflicts not shown" if len(conflicts) > limit else ""
+    return f"""
+        <br><br><b style='color: red;'>\u26a0 Cross-gateway conflicts: {len(conflicts)}</b>
+        <table class="table table-bordered table-sm mt-2">
+            <thead><tr><th>Satellite</th><th>Gateway</th><th>Conflicting Gateway</th><th>Overlap Start</th><th>Overlap End</th><th>Overlap (min)</th></tr></thead>
+            <tbody>{rows}</tbody>
+        </table>{more}
+        """
+
 def handle_plan_analysis(request):
     """Handle plan analysis form submission."""
+    progress_id = request_job_id(request)
+    start_progress(progress_id, 'plan_analysis')
     try:
         full_plan_file = request.files.get('full_plan')
         
@@ -342,9 +667,10 @@ def handle_plan_analysis(request):
             return redirect(url_for('index'))
         
         # Check file extension
-        if not full_plan_file.filename.lower().endswith('.txt'):
+        if not is_accepted_upload(full_plan_file.filename, '.txt'):
             flash("Please upload a .txt file", "error")
             return redirect(url_for('index'))
+        plan_stream = open_upload(full_plan_file, '.txt')
         
         # Get optional deploy date/time
         deploy_date_str = request.form.get('Deploy_Date', '').strip()
@@ -364,30 +690,62 @@ def handle_plan_analysis(request):
             flash("Both deploy date and time must be provided if updating dates", "error")
             return redirect(url_for('index'))
         
+        return render_plan_analysis(plan_stream, progress_id, new_deploy_date, new_deploy_time,
+                                    repair_gaps=bool(request.form.get('repair_gaps')))
+
+    except ValueError as e:
+        finish_progress(progress_id, e)
+        flash(str(e), "error")
+        return redirect(url_for('index'))
+    except Exception as e:
+        finish_progress(progress_id, e)
+        flash(f"Error processing plan analysis file: {str(e)}", "error")
+        return redirect(url_for('index'))
+    finally:
+        release_progress(progress_id)
+
+def render_plan_analysis(plan_stream, progress_id, new_deploy_date=None, new_deploy_time=None, repair_gaps=False, merged=False):
+    """Analyze a plan stream and render the results page.
+
+    Used by plan analysis and by merge-and-analyze (`merged=True`), which offers the
+    merged plan for download instead of an updated one.
+    """
+    try:
         try:
-            df, dates_updated = analyze_plan_txt_file(full_plan_file.stream, new_deploy_date, new_deploy_time)
+            report_progress(progress_id, 'parsing')
+            df, dates_updated = analyze_plan_txt_file(plan_stream, new_deploy_date, new_deploy_time)
+            updated_plan = df.attrs.pop('updated_plan', None)
+            conflicts = flag_satellite_conflicts(df)
             df_reset = df.reset_index(drop=True)
 
         except ValueError as e:
+            finish_progress(progress_id, e)
             flash(f"Error parsing file: {str(e)}", "error")
             return redirect(url_for('index'))
         
         if df.empty:
+            finish_progress(progress_id, "No valid track data")
             flash("The file contains no valid track data", "error")
             return redirect(url_for('index'))
 
-        def flag_color(v):
-                    if 'SHORT' in v or 'LONG' in v or 'NO OVERLAP' in v:
-                        return 'background-color: #f8d7da;'
-                    return ''
-        
-        # Apply background styling to the Flag column 
-        styled_table = df_reset.style \
-            .set_table_attributes('class="table table-bordered table-sm table-hover"') \
-            .hide(axis='index') \
-            .applymap(flag_color, subset=['Flag'])
+        report_progress(progress_id, 'parsed', tracks=len(df), gateways=int(df['Gateway'].nunique()), conflicts=len(conflicts),
+                        gateways_reused=df.attrs.get('gateways_reused', 0))
 
-        styled_table_html = styled_table.to_html()
+        # Zoomed detail windows are served from this request's plan, not whichever was analyzed last
+        analysis_id = uuid.uuid4().hex
+        with stored_plan_lock:
+            stored_plan_dfs[analysis_id] = df
+            while len(stored_plan_dfs) > PLAN_DETAIL_HISTORY:
+                stored_plan_dfs.popitem(last=False)
+
+        # Large tables are filtered and rendered client-side from indexed JSON
+        table_data = None
+        if len(df_reset) > VIRTUAL_TABLE_THRESHOLD:
+            table_data = build_table_payload(df_reset, ['Gateway', 'Satellite'])
+
+        # Smaller tables are streamed into the page as HTML, flagged rows highlighted by class
+        table_chunks = render_table_chunks(df_reset) if table_data is None else []
+        report_progress(progress_id, 'table', rows=len(df_reset))
 
         # Create summary statistics
         first_start = df['Start'].min()
@@ -398,6 +756,7 @@ def handle_plan_analysis(request):
         short_count = sum(1 for flag in df['Flag'] if 'SHORT' in flag)
         long_count = sum(1 for flag in df['Flag'] if 'LONG' in flag)
         no_overlap_count = sum(1 for flag in df['Flag'] if 'NO OVERLAP' in flag)
+        conflict_count = sum(1 for flag in df['Flag'] if 'CONFLICT' in flag)
         flagged_count = sum(1 for flag in df['Flag'] if flag != 'OK')
         
         # Display stats
@@ -408,23 +767,52 @@ def handle_plan_analysis(request):
         Short tracks (under 24 mins): {short_count}<br>
         Long tracks (over 45 mins): {long_count}<br>
         No Overlap (no satellite connected to the gateway): {no_overlap_count}<br>
+        Conflicts (satellite scheduled on two gateways at once): {conflict_count}<br>
         Tracks flagged: {flagged_count}<br>
         {"<span style='color: red;'>\u26a0 Schedule exceeds 24-hour period</span>" if time_span_hours > 24 else "\u2705 Schedule fits within a 24-hour period"}
         """
+
+        if conflicts:
+            stats += build_conflict_report(conflicts)
         
         # Add date update info if dates were updated
         if dates_updated:
             stats += f"<br><br><span style='color: green;'>\u2705 Dates updated to deploy date: {new_deploy_date.strftime('%Y-%m-%d')} at {new_deploy_time.strftime('%H:%M:%S')}</span>"
         
+        # Propose timing repairs for NO OVERLAP gaps if requested
+        repair_report = None
+        if repair_gaps:
+            if dates_updated:
+                plan_content = updated_plan
+            else:
+                plan_stream.seek(0)
+                plan_content = plan_stream.read().decode('utf-8', errors='ignore')
+            changes, unrepaired = repair_plan_gaps(df, plan_content)
+            repair_report = build_repair_report(changes, unrepaired)
+            report_progress(progress_id, 'repaired', tracks_adjusted=len(changes), gaps_remaining=len(unrepaired))
+
         # Generate the Gantt chart
-        tabs = generate_gantt_multi_gateway(df)
+        tabs = generate_gantt_multi_gateway(
+            df, on_gateway=lambda done, total: report_progress(progress_id, 'charts', gateways_charted=done, gateways=total),
+            analysis_id=analysis_id)
+
+        gateways_reused = df.attrs.get('gateways_reused', 0)
+        charts_reused = sum(1 for tab in tabs if tab['cached'])
+        if gateways_reused or charts_reused:
+            stats += (f"<br><br>\u267b Reused from the previous analysis: tracks of {gateways_reused} "
+                      f"and charts of {charts_reused} of {len(tabs)} gateways")
         
-        return render_template('plan_analysis.html', table=styled_table_html, stats=stats, tabs=tabs, dates_updated=dates_updated)
+        page = stream_template('plan_analysis.html', table=table_chunks, table_data=table_data, stats=stats, tabs=tabs, dates_updated=dates_updated, repair_report=repair_report, merged=merged)
+
+        # The page is sent as it renders; progress finishes once the last chunk is out
+        return Response(stream_with_progress(progress_id, page), mimetype='text/html')
 
     except ValueError as e:
+        finish_progress(progress_id, e)
         flash(str(e), "error")
         return redirect(url_for('index'))
     except Exception as e:
+        finish_progress(progress_id, e)
         flash(f"Error processing plan analysis file: {str(e)}", "error")
         return redirect(url_for('index'))
 
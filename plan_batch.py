@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Plan Batch Module
+Generates re-dated copies of a plan for every day in a date range in one pass.
+
+Usage:
+    python plan_batch.py full_plan.txt --start 20240301 --end 20240307 --deploy-time 00:00:00 --output-dir plans/
+"""
+
+from flask import request, flash, redirect, url_for, Response
+import argparse
+import io
+import os
+import zipfile
+from datetime import datetime, timedelta
+from compression import is_accepted_upload, read_upload_text
+from progress import request_job_id, start_progress, report_progress, finish_progress, release_progress, stream_with_progress
+
+# Upper bound on the number of plans generated per request
+BATCH_MAX_DAYS = 366
+
+def build_redate_template(file_content):
+    """Parse a plan once into a body template re-datable by str.format.
+
+    Track lines get `{0}` (deploy day) or `{1}` (next day, for tracks crossing midnight)
+    in place of their date, lines that look like tracks but fail to parse are kept as-is,
+    and everything else is dropped. Returns the template and the earliest track start
+    time-of-day, which the epoch line is based on. update_plan_dates_new uses it for a
+    single day.
+    """
+    lines = file_content.strip().split('\n')
+    if len(lines) < 3:
+        raise ValueError("Invalid plan file format")
+
+    gateway_start = next((i for i, line in enumerate(lines) if line.startswith('GS_')), None)
+    if gateway_start is None:
+        raise ValueError("No gateway lines found")
+
+    body_lines = []
+    first_start_time = None
+    current_gateway = None
+    emitted_gateway = None
+
+    for line in lines[gateway_start:]:
+        line = line.strip()
+        if line.startswith('GS_'):
+            current_gateway = line
+            continue
+
+        parts = line.split()
+        if len(parts) >= 5 and parts[1] == 'DAT' and parts[2] == 'RECUR':
+            if current_gateway != emitted_gateway:
+                emitted_gateway = current_gateway
+                body_lines.append(current_gateway.replace('{', '{{').replace('}', '}}'))
+            try:
+                start_time = datetime.strptime(parts[3].split('.')[0], "%Y%m%d%H%M%S").time()
+                end_time = datetime.strptime(parts[4].split('.')[0], "%Y%m%d%H%M%S").time()
+            except Exception:
+                # Keep non-track lines as is
+                body_lines.append(line.replace('{', '{{').replace('}', '}}'))
+                continue
+
+            if first_start_time is None or start_time < first_start_time:
+                first_start_time = start_time
+            prefix = f"{parts[0]} {parts[1]} {parts[2]}".replace('{', '{{').replace('}', '}}')
+            end_day = '{1}' if end_time < start_time else '{0}'
+            body_lines.append(f"{prefix} {{0}}{start_time.strftime('%H%M%S')}.000 {end_day}{end_time.strftime('%H%M%S')}.000")
+
+    if first_start_time is None:
+        raise ValueError("No valid tracks found for date update")
+
+    return '\n'.join(body_lines), first_start_time
+
+def date_range_strings(start_date, end_date):
+    """Return (deploy day, next day) YYYYMMDD string arrays for an inclusive date range."""
+    import numpy as np
+    days = np.arange(np.datetime64(start_date.date(), 'D'), np.datetime64(end_date.date(), 'D') + np.timedelta64(2, 'D'))
+    day_strings = np.char.replace(np.datetime_as_string(days, unit='D'), '-', '')
+    return day_strings[:-1], day_strings[1:]
+
+def generate_plan_batch(file_content, start_date, end_date, deploy_time):
+    """Yield (YYYYMMDD, plan content) for every day from start_date to end_date inclusive."""
+    if end_date < start_date:
+        raise ValueError("End date must not be before start date")
+    if (end_date - start_date).days + 1 > BATCH_MAX_DAYS:
+        raise ValueError(f"Date range is limited to {BATCH_MAX_DAYS} days")
+
+    template, first_start_time = build_redate_template(file_content)
+    deploy_clock = deploy_time.strftime("%H%M%S")
+
+    day = start_date
+    for day_str, next_day_str in zip(*date_range_strings(start_date, end_date)):
+        epoch_millis = int(datetime.combine(day.date(), first_start_time).timestamp() * 1000)
+        header = f"{epoch_millis}\n{day_str}{deploy_clock}.000\n"
+        yield str(day_str), header + template.format(day_str, next_day_str)
+        day += timedelta(days=1)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink that collects what zipfile writes so it can be streamed."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return b''.join(chunks)
+
+def stream_plan_zip(plans):
+    """Stream (day, content) plans as a zip archive, one member per day."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for day_str, content in plans:
+            archive.writestr(f"plan_{day_str}.txt", content)
+            yield sink.drain()
+    yield sink.drain()
+
+def handle_plan_batch(request):
+    """Handle batch plan generation form submission."""
+    progress_id = request_job_id(request)
+    start_progress(progress_id, 'plan_batch')
+    try:
+        full_plan_file = request.files.get('full_plan')
+
+        if not full_plan_file or full_plan_file.filename == '':
+            flash("No file selected", "error")
+            return redirect(url_for('index'))
+
+        if not is_accepted_upload(full_plan_file.filename, '.txt'):
+            flash("Please upload a .txt file", "error")
+            return redirect(url_for('index'))
+
+        try:
+            start_date = datetime.strptime(request.form.get('Start_Date', '').strip(), "%Y%m%d")
+            end_date = datetime.strptime(request.form.get('End_Date', '').strip(), "%Y%m%d")
+            deploy_time = datetime.strptime(request.form.get('Deploy_Time', '').strip(), "%H:%M:%S")
+        except ValueError:
+            flash("Invalid start date, end date or deploy time format", "error")
+            return redirect(url_for('index'))
+
+        content = read_upload_text(full_plan_file, '.txt')
+
+        # Parse and validate up front so errors are reported before the download starts
+        plans = generate_plan_batch(content, start_date, end_date, deploy_time)
+        first_plan = next(plans)
+        report_progress(progress_id, 'parsed', days=(end_date - start_date).days + 1)
+
+        def all_plans():
+            yield first_plan
+            yield from plans
+
+        filename = f"plans_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.zip"
+        return Response(stream_with_progress(progress_id, stream_plan_zip(all_plans())), mimetype='application/zip',
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+    except ValueError as e:
+        finish_progress(progress_id, e)
+        flash(str(e), "error")
+        return redirect(url_for('index'))
+    except Exception as e:
+        finish_progress(progress_id, e)
+        flash(f"Error generating plan batch: {str(e)}", "error")
+        return redirect(url_for('index'))
+    finally:
+        release_progress(progress_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate re-dated copies of a plan for every day in a date range.")
+    parser.add_argument('plan', help="Full plan TXT file")
+    parser.add_argument('--start', required=True, help="First deploy date (YYYYMMDD)")
+    parser.add_argument('--end', required=True, help="Last deploy date (YYYYMMDD), inclusive")
+    parser.add_argument('--deploy-time', required=True, help="Deploy time (HH:MM:SS)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--output-dir', help="Write one plan_YYYYMMDD.txt per day into this directory")
+    output.add_argument('--zip', help="Write all plans into this zip archive")
+    args = parser.parse_args()
+
+    with open(args.plan, encoding='utf-8', errors='ignore') as plan_file:
+        content = plan_file.read()
+    plans = generate_plan_batch(content,
+                                datetime.strptime(args.start, "%Y%m%d"),
+                                datetime.strptime(args.end, "%Y%m%d"),
+                                datetime.strptime(args.deploy_time, "%H:%M:%S"))
+
+    if args.zip:
+        with open(args.zip, 'wb') as zip_file:
+            for chunk in stream_plan_zip(plans):
+                zip_file.write(chunk)
+        print(f"Wrote {args.zip}")
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        count = 0
+        for day_str, plan in plans:
+            with open(os.path.join(args.output_dir, f"plan_{day_str}.txt"), 'w', encoding='utf-8') as out:
+                out.write(plan)
+            count += 1
+        print(f"Wrote {count} plans to {args.output_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,24 @@ Plan Merge Module
 Handles merging of satellite tracking plans.
 """
 
-from flask import render_template, request, send_file, flash, redirect, url_for
+from flask import render_template, request, send_file, flash, redirect, url_for, jsonify
+from array import array
 from datetime import datetime, timedelta
 from io import BytesIO
+from compression import is_accepted_upload, read_upload_text
+from progress import request_job_id, start_progress, report_progress, finish_progress, release_progress
 
 # Global memory buffer for merged plan
 stored_merged_plan = BytesIO()
 download_used = {'merged': False}
 
+# Merged plan bytes with the offset of every line start and the line number of every gateway
+merged_preview_index = {'data': b'', 'offsets': array('q', [0]), 'gateways': {}}
+
+# Lines per preview page, and the most a single preview request may return
+PREVIEW_PAGE_LINES = 50
+PREVIEW_MAX_LINES = 1000
+
 def parse_plan_for_merge(file_content):
     """Parse plan file and extract gateway data."""
     try:
@@ -81,58 +91,100 @@ def update_track_dates(track_lines, new_date_str):
     
     return updated_lines
 
+def assemble_plan(epoch, now_time, gateway_tracks):
+    """Build plan content from header lines and an ordered mapping of gateway to track lines."""
+    merged_lines = [epoch, now_time]
+    for gateway_name, tracks in gateway_tracks.items():
+        merged_lines.append(gateway_name)
+        merged_lines.extend(tracks)
+    return '\n'.join(merged_lines) + '\n'
+
+def build_merged_plan(old_gateways, new_gateway_content):
+    """Merge parsed old plan gateways with new gateway data and return the merged content."""
+    # Parse the new gateway file
+    new_lines = new_gateway_content.strip().split('\n')
+    if len(new_lines) < 3:
+        raise ValueError("Invalid new gateway file format")
+        
+    new_epoch = new_lines[0]
+    new_now_time = new_lines[1]
+    new_gateway_name = new_lines[2]
+    new_tracks = new_lines[3:]
+    
+    # Extract date from new gateway's now time
+    new_date_str = new_now_time[:8]  # YYYYMMDD
+    
+    # Update all gateway dates to match the new date and replace matching gateway,
+    # keeping the original gateway order from the old plan
+    updated_gateways = {}
+    for gateway_name, tracks in old_gateways.items():
+        if gateway_name == new_gateway_name:
+            # REPLACE with new gateway data
+            updated_gateways[gateway_name] = new_tracks
+        else:
+            # Update dates but keep existing tracks
+            updated_gateways[gateway_name] = update_track_dates(tracks, new_date_str)
+    
+    # If the new gateway was not in the old plan, add it at the end
+    if new_gateway_name not in updated_gateways:
+        updated_gateways[new_gateway_name] = new_tracks
+    
+    return assemble_plan(new_epoch, new_now_time, updated_gateways)
+
+def build_line_index(data):
+    """Index plan bytes by line: (line start offsets plus end offset, gateway -> line number).
+
+    Line numbers are 1-based; offsets[i - 1] is where line i starts and the last entry
+    is the end of the data, so line i spans offsets[i - 1]:offsets[i].
+    """
+    offsets = array('q')
+    gateways = {}
+    pos = 0
+    while pos < len(data):
+        end = data.find(b'\n', pos)
+        if end == -1:
+            end = len(data)
+        offsets.append(pos)
+        if data.startswith(b'GS_', pos):
+            gateways.setdefault(data[pos:end].decode('utf-8').strip(), len(offsets))
+        pos = end + 1
+    offsets.append(len(data))
+    return offsets, gateways
+
+def read_merged_lines(start, count):
+    """Return up to `count` lines of the stored merged plan starting at 1-based line `start`.
+
+    Only the requested byte range is decoded, so a page costs O(page size).
+    """
+    index = merged_preview_index
+    offsets = index['offsets']
+    total_lines = len(offsets) - 1
+    start = max(1, min(start, total_lines or 1))
+    end = min(total_lines, start - 1 + count)
+    data = index['data'][offsets[start - 1]:offsets[end]] if end >= start else b''
+    return {
+        'start': start,
+        'end': end,
+        'total_lines': total_lines,
+        'lines': data.decode('utf-8', errors='replace').splitlines()
+    }
+
 def merge_plans(old_plan_content, new_gateway_content):
     """Merge old plan with new gateway data."""
-    global stored_merged_plan, download_used
+    global stored_merged_plan, download_used, merged_preview_index
     
     try:
-        # Parse the new gateway file
-        new_lines = new_gateway_content.strip().split('\n')
-        if len(new_lines) < 3:
-            raise ValueError("Invalid new gateway file format")
-            
-        new_epoch = new_lines[0]
-        new_now_time = new_lines[1]
-        new_gateway_name = new_lines[2]
-        new_tracks = new_lines[3:]
-        
-        # Extract date from new gateway's now time
-        new_date_str = new_now_time[:8]  # YYYYMMDD
-        
         # Parse the old plan
         old_gateways = parse_plan_for_merge(old_plan_content)
         
-        # Update all gateway dates to match the new date and replace matching gateway
-        updated_gateways = {}
-        gateway_updated = False
-        for gateway_name, tracks in old_gateways.items():
-            if gateway_name == new_gateway_name:
-                # REPLACE with new gateway data
-                updated_gateways[gateway_name] = new_tracks
-                gateway_updated = True
-            else:
-                # Update dates but keep existing tracks
-                updated_gateways[gateway_name] = update_track_dates(tracks, new_date_str)
-        
         # Generate the merged plan with proper ordering
-        merged_content = f"{new_epoch}\n{new_now_time}\n"
-        
-        # Use the original gateway order from old plan
-        for gateway_name in old_gateways.keys():
-            merged_content += f"{gateway_name}\n"
-            for track in updated_gateways[gateway_name]:
-                merged_content += f"{track}\n"
+        merged_content = build_merged_plan(old_gateways, new_gateway_content)
         
-        # If the new gateway was not in the old plan, add it at the end
-        if not gateway_updated:
-            merged_content += f"{new_gateway_name}\n"
-            for track in new_tracks:
-                merged_content += f"{track}\n"
-        
-        # Store in memory buffer
-        stored_merged_plan = BytesIO()
-        stored_merged_plan.write(merged_content.encode("utf-8"))
-        stored_merged_plan.seek(0)
+        # Store in memory buffer, indexed by line for the paged preview
+        merged_data = merged_content.encode("utf-8")
+        offsets, gateways = build_line_index(merged_data)
+        merged_preview_index = {'data': merged_data, 'offsets': offsets, 'gateways': gateways}
+        stored_merged_plan = BytesIO(merged_data)
         download_used['merged'] = False
         
         return merged_content
@@ -141,6 +193,8 @@ def merge_plans(old_plan_content, new_gateway_content):
 
 def handle_plan_merge(request):
     """Handle plan merge form submission."""
+    progress_id = request_job_id(request)
+    start_progress(progress_id, 'plan_merge')
     try:
         old_plan_file = request.files['old_plan']
         new_gateway_file = request.files['new_gateway']
@@ -150,33 +204,45 @@ def handle_plan_merge(request):
             return redirect(url_for('index'))
         
         # Check file extensions
-        if not old_plan_file.filename.lower().endswith('.txt'):
+        if not is_accepted_upload(old_plan_file.filename, '.txt'):
             flash("Wrong file type for old plan. Please upload a TXT file.", "error")
             return redirect(url_for('index'))
             
-        if not new_gateway_file.filename.lower().endswith('.txt'):
+        if not is_accepted_upload(new_gateway_file.filename, '.txt'):
             flash("Wrong file type for new gateway. Please upload a TXT file.", "error")
             return redirect(url_for('index'))
         
-        old_plan_content = old_plan_file.read().decode('utf-8')
-        new_gateway_content = new_gateway_file.read().decode('utf-8')
+        old_plan_content = read_upload_text(old_plan_file, '.txt')
+        new_gateway_content = read_upload_text(new_gateway_file, '.txt')
+        report_progress(progress_id, 'read', bytes_read=len(old_plan_content) + len(new_gateway_content))
         
         merged_content = merge_plans(old_plan_content, new_gateway_content)
+        report_progress(progress_id, 'merged', bytes_merged=len(merged_content))
+
+        if request.form.get('analyze'):
+            # Imported here because plan_analysis itself depends on this module
+            from plan_analysis import render_plan_analysis
+            return render_plan_analysis(BytesIO(merged_content.encode('utf-8')), progress_id, merged=True)
         
-        # Display success message and preview
-        preview_lines = merged_content.split('\n')[:50]  # Show first 50 lines
-        preview = '\n'.join(preview_lines)
-        if len(merged_content.split('\n')) > 50:
-            preview += '\n... (truncated)'
+        # Display success message and the first preview page; further pages are fetched on demand
+        page = read_merged_lines(1, PREVIEW_PAGE_LINES)
         
-        return render_template('plan_merge.html', preview=preview)
+        html = render_template('plan_merge.html', preview='\n'.join(page['lines']), page=page,
+                               page_lines=PREVIEW_PAGE_LINES, gateways=list(merged_preview_index['gateways']))
+        report_progress(progress_id, 'rendered', bytes_rendered=len(html.encode('utf-8')))
+        finish_progress(progress_id)
+        return html
         
     except ValueError as e:
+        finish_progress(progress_id, e)
         flash(str(e), "error")
         return redirect(url_for('index'))
     except Exception as e:
+        finish_progress(progress_id, e)
         flash("Error with file", "error")
         return redirect(url_for('index'))
+    finally:
+        release_progress(progress_id)
 
 def download_merged():
     """Download merged plan file."""
@@ -187,4 +253,23 @@ def download_merged():
     
     stored_merged_plan.seek(0)
     download_used['merged'] = True
-    return send_file(stored_merged_plan, mimetype='text/plain', as_attachment=True, download_name='merged_plan.txt')
\ No newline at end of file
+    return send_file(stored_merged_plan, mimetype='text/plain', as_attachment=True, download_name='merged_plan.txt')
+
+def merged_preview():
+    """Return a page of the merged plan by line range (start, count) or gateway section."""
+    if not merged_preview_index['data']:
+        return jsonify({'error': 'No plan has been merged yet'}), 404
+
+    gateway = request.args.get('gateway', '')
+    try:
+        start = int(request.args.get('start', 1))
+        count = min(PREVIEW_MAX_LINES, max(1, int(request.args.get('count', PREVIEW_PAGE_LINES))))
+    except ValueError:
+        return jsonify({'error': 'Invalid line range'}), 400
+
+    if gateway:
+        if gateway not in merged_preview_index['gateways']:
+            return jsonify({'error': f'Unknown gateway {gateway}'}), 404
+        start = merged_preview_index['gateways'][gateway]
+
+    return jsonify(read_merged_lines(start, count))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Plan Repair Module
+Proposes minimal track timing adjustments that close NO OVERLAP gaps within the duration bounds.
+"""
+
+from flask import send_file, flash, redirect, url_for
+from datetime import datetime, timedelta
+from io import BytesIO
+from html import escape
+
+# Duration bounds (minutes) a repaired track must stay within, matching the SHORT/LONG flags
+SHORT_MINUTES = 24
+LONG_MINUTES = 45
+
+# Global memory buffer for repaired plan download
+stored_repaired_plan = BytesIO()
+download_used = {'repaired': False}
+
+def repair_gateway_gaps(tracks):
+    """Close gaps between consecutive tracks of one gateway.
+
+    `tracks` is a list of [satellite, start, end] sorted by start. Each gap is closed by
+    extending the earlier track's end as far as the LONG bound allows and pulling the later
+    track's start forward for the rest, so the total adjustment equals the gap (the minimum).
+    The earlier track's room is spent first because the later track's room is also needed
+    for the gap after it. A single sweep handles the gateway; tracks are only ever
+    lengthened, never shortened.
+    Returns the adjusted [start, end] pairs and the gaps that could not be fully closed.
+    """
+    max_seconds = LONG_MINUTES * 60
+    adjusted = [[start, end] for _, start, end in tracks]
+    unrepaired = []
+
+    for i in range(len(adjusted) - 1):
+        current, following = adjusted[i], adjusted[i + 1]
+        gap = int((following[0] - current[1]).total_seconds())
+        if gap <= 0:
+            continue
+
+        # Room each track has left before it would become LONG
+        room_current = max(0, max_seconds - int((current[1] - current[0]).total_seconds()))
+        room_following = max(0, max_seconds - int((following[1] - following[0]).total_seconds()))
+
+        extend_current = min(room_current, gap)
+        extend_following = min(room_following, gap - extend_current)
+
+        current[1] += timedelta(seconds=extend_current)
+        following[0] -= timedelta(seconds=extend_following)
+
+        remaining = gap - extend_current - extend_following
+        if remaining > 0:
+            unrepaired.append({
+                'after': tracks[i][0],
+                'before': tracks[i + 1][0],
+                'gap_start': current[1],
+                'gap_end': following[0],
+                'minutes': remaining / 60
+            })
+
+    return adjusted, unrepaired
+
+def propose_gap_repairs(df):
+    """Propose gap repairs for every gateway of an analyzed plan DataFrame."""
+    changes = []
+    unrepaired = []
+
+    for gateway, gateway_df in df.groupby('Gateway', sort=False):
+        gateway_df = gateway_df.sort_values('Start', kind='stable')
+        tracks = [[sat, start.to_pydatetime(), end.to_pydatetime()]
+                  for sat, start, end in zip(gateway_df['Satellite'], gateway_df['Start'], gateway_df['End'])]
+        adjusted, gaps = repair_gateway_gaps(tracks)
+
+        for (satellite, old_start, old_end), (new_start, new_end) in zip(tracks, adjusted):
+            if new_start != old_start or new_end != old_end:
+                changes.append({
+                    'gateway': gateway,
+                    'satellite': satellite,
+                    'old_start': old_start,
+                    'old_end': old_end,
+                    'new_start': new_start,
+                    'new_end': new_end,
+                    'duration': (new_end - new_start).total_seconds() / 60
+                })
+        for gap in gaps:
+            gap['gateway'] = gateway
+            unrepaired.append(gap)
+
+    return changes, unrepaired
+
+def write_repaired_plan(content, changes):
+    """Rewrite the start/end of changed track lines in a plan, leaving every other line untouched."""
+    replacements = {(c['gateway'], c['satellite'], c['old_start'], c['old_end']): c for c in changes}
+    output_lines = []
+    current_gateway = None
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('GS_'):
+            current_gateway = stripped
+        else:
+            parts = stripped.split()
+            if len(parts) >= 5 and parts[1] == 'DAT' and parts[2] == 'RECUR':
+                try:
+                    start = datetime.strptime(parts[3].split('.')[0], "%Y%m%d%H%M%S")
+                    end = datetime.strptime(parts[4].split('.')[0], "%Y%m%d%H%M%S")
+                except ValueError:
+                    start = end = None
+                change = replacements.get((current_gateway, parts[0], start, end))
+                if change:
+                    parts[3] = change['new_start'].strftime("%Y%m%d%H%M%S.000")
+                    parts[4] = change['new_end'].strftime("%Y%m%d%H%M%S.000")
+                    line = ' '.join(parts)
+        output_lines.append(line)
+
+    return '\n'.join(output_lines)
+
+def repair_plan_gaps(df, content):
+    """Propose repairs for a plan, store the repaired plan for download and return the report parts."""
+    global stored_repaired_plan, download_used
+    changes, unrepaired = propose_gap_repairs(df)
+
+    stored_repaired_plan = BytesIO()
+    stored_repaired_plan.write(write_repaired_plan(content, changes).encode("utf-8"))
+    stored_repaired_plan.seek(0)
+    download_used['repaired'] = False
+
+    return changes, unrepaired
+
+def build_repair_report(changes, unrepaired):
+    """Build the HTML per-track change report for the repaired plan."""
+    def shift(new, old):
+        return f"{(new - old).total_seconds() / 60:+.1f}"
+
+    rows = "".join(
+        f"<tr><td>{escape(str(c['gateway']))}</td><td>{escape(str(c['satellite']))}</td>"
+        f"<td>{c['old_start'].strftime('%H:%M:%S')} → {c['new_start'].strftime('%H:%M:%S')}</td>"
+        f"<td>{c['old_end'].strftime('%H:%M:%S')} → {c['new_end'].strftime('%H:%M:%S')}</td>"
+        f"<td>{shift(c['new_start'], c['old_start'])}</td><td>{shift(c['new_end'], c['old_end'])}</td>"
+        f"<td>{c['duration']:.1f}</td></tr>"
+        for c in changes
+    )
+    report = f"""
+        <b>Tracks adjusted:</b> {len(changes)}<br>
+        <b>Gaps that could not be closed within {LONG_MINUTES} min tracks:</b> {len(unrepaired)}<br>
+        <table class="table table-bordered table-sm mt-2">
+            <thead><tr><th>Gateway</th><th>Satellite</th><th>Start</th><th>End</th><th>Start Shift (min)</th><th>End Shift (min)</th><th>New Duration (min)</th></tr></thead>
+            <tbody>{rows}</tbody>
+        </table>
+        """
+    if unrepaired:
+        gap_rows = "".join(
+            f"<tr><td>{escape(str(g['gateway']))}</td><td>{escape(str(g['after']))}</td><td>{escape(str(g['before']))}</td>"
+            f"<td>{g['gap_start'].strftime('%H:%M:%S')}</td><td>{g['gap_end'].strftime('%H:%M:%S')}</td>"
+            f"<td>{g['minutes']:.1f}</td></tr>"
+            for g in unrepaired
+        )
+        report += f"""
+        <b style='color: red;'>⚠ Remaining gaps (need a manual fix):</b>
+        <table class="table table-bordered table-sm mt-2">
+            <thead><tr><th>Gateway</th><th>After</th><th>Before</th><th>Gap Start</th><th>Gap End</th><th>Gap (min)</th></tr></thead>
+            <tbody>{gap_rows}</tbody>
+        </table>
+        """
+    return report
+
+def download_repaired_plan():
+    """Download repaired plan file."""
+    global stored_repaired_plan, download_used
+    if download_used['repaired']:
+        flash("File already downloaded", "error")
+        return redirect(url_for('index'))
+
+    stored_repaired_plan.seek(0)
+    download_used['repaired'] = True
+    return send_file(stored_repaired_plan, mimetype='text/plain', as_attachment=True, download_name='repaired_plan.txt')
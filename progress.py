@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Progress Module
+Tracks stage-level progress of in-flight analyses and streams it as server-sent events.
+
+Set STP_PROFILE_MEMORY=1 to also record the tracemalloc peak of every stage. Tracing is
+process-wide, so stage peaks are only attributable when requests do not overlap.
+"""
+
+from flask import Response, stream_with_context
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+# Seconds a client may wait for its job to start, finished jobs are kept around, and
+# unfinished jobs are kept after their last event before they count as abandoned
+JOB_WAIT_SECONDS = 30
+JOB_RETENTION_SECONDS = 300
+JOB_ABANDON_SECONDS = 3600
+
+# Opt-in per-stage peak memory profiling
+PROFILE_MEMORY = os.environ.get('STP_PROFILE_MEMORY', '') == '1'
+
+# Global progress state shared between request threads
+progress_jobs = {}
+progress_condition = threading.Condition()
+
+def request_job_id(request):
+    """Return the client's progress id, or a server-side one when memory profiling is on.
+
+    The server-side id makes requests without a progress bar show up in the stage profiles.
+    """
+    job_id = request.form.get('progress_id', '').strip()
+    if not job_id and PROFILE_MEMORY:
+        job_id = f"server-{uuid.uuid4().hex}"
+    return job_id
+
+def start_progress(job_id, label=None):
+    """Register a new job so progress streams can attach to it."""
+    if not job_id:
+        return
+    now = time.time()
+    with progress_condition:
+        # Drop finished jobs nobody is listening to anymore, and jobs that stopped reporting long ago
+        for stale_id in [k for k, job in progress_jobs.items()
+                         if now - job['updated'] > (JOB_RETENTION_SECONDS if job['done'] else JOB_ABANDON_SECONDS)]:
+            del progress_jobs[stale_id]
+        progress_jobs[job_id] = {'started': now, 'updated': now, 'done': False, 'streaming': False,
+                                 'events': [], 'label': label}
+        if PROFILE_MEMORY:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        progress_condition.notify_all()
+
+def report_progress(job_id, stage, **counts):
+    """Record a stage event (with elapsed seconds) for a job and wake up its listeners."""
+    if not job_id:
+        return
+    with progress_condition:
+        job = progress_jobs.get(job_id)
+        if job is None:
+            return
+        now = time.time()
+        event = {'stage': stage, 'elapsed': round(now - job['started'], 3)}
+        if PROFILE_MEMORY and tracemalloc.is_tracing():
+            # Peak since the previous stage, i.e. the high-water mark of the stage just finished
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            event['current_mb'] = round(current / (1024 * 1024), 1)
+            event['peak_mb'] = round(peak / (1024 * 1024), 1)
+        event.update(counts)
+        job['events'].append(event)
+        job['updated'] = now
+        if stage in ('done', 'error'):
+            job['done'] = True
+        progress_condition.notify_all()
+
+def finish_progress(job_id, error=None):
+    """Mark a job as finished, successfully or not; a job that already finished is left alone."""
+    with progress_condition:
+        job = progress_jobs.get(job_id)
+        if job is None or job['done']:
+            return
+    if error is None:
+        report_progress(job_id, 'done')
+    else:
+        report_progress(job_id, 'error', message=str(error))
+
+def release_progress(job_id):
+    """Finish a job its handler returned without finishing, unless a streamed page still owns it.
+
+    Handlers call this on every exit so rejected uploads still end their progress stream.
+    """
+    with progress_condition:
+        job = progress_jobs.get(job_id)
+        if job is None or job['done'] or job['streaming']:
+            return
+    finish_progress(job_id, "Request ended without a result")
+
+def stream_with_progress(job_id, chunks):
+    """Pass a streamed page through, finishing the job once the last chunk is sent."""
+    with progress_condition:
+        job = progress_jobs.get(job_id)
+        if job is not None:
+            job['streaming'] = True
+    return _stream_chunks(job_id, chunks)
+
+def _stream_chunks(job_id, chunks):
+    bytes_rendered = 0
+    # Also reported when the client disconnects and the server closes the generator mid-stream
+    error = "Client disconnected before the response was sent"
+    try:
+        for chunk in chunks:
+            bytes_rendered += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+        report_progress(job_id, 'rendered', bytes_rendered=bytes_rendered)
+        error = None
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        finish_progress(job_id, error)
+
+def stage_profiles():
+    """Return recorded jobs, newest first, with their stage timings (and memory peaks)."""
+    with progress_condition:
+        jobs = sorted(progress_jobs.items(), key=lambda item: item[1]['started'], reverse=True)
+        return [{
+            'job_id': job_id,
+            'label': job['label'],
+            'done': job['done'],
+            'profiling_memory': PROFILE_MEMORY,
+            'stages': list(job['events'])
+        } for job_id, job in jobs]
+
+def stream_progress(job_id):
+    """Return a text/event-stream response replaying and following a job's events."""
+    def generate():
+        sent = 0
+        deadline = time.time() + JOB_WAIT_SECONDS
+        while True:
+            # Only decide what to send under the lock; writing to a slow client must not block reporters
+            with progress_condition:
+                job = progress_jobs.get(job_id)
+                if job is None or sent >= len(job['events']):
+                    if job is not None and job['done']:
+                        return
+                    if job is None and time.time() > deadline:
+                        pending = None
+                    else:
+                        progress_condition.wait(timeout=15)
+                        job = progress_jobs.get(job_id)
+                        pending = [] if job is None else job['events'][sent:]
+                else:
+                    pending = job['events'][sent:]
+                sent += len(pending or [])
+            if pending is None:
+                yield "event: timeout\ndata: {}\n\n"
+                return
+            if not pending:
+                # Keep the connection alive through proxies
+                yield ": keep-alive\n\n"
+            for event in pending:
+                yield f"data: {json.dumps(event)}\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
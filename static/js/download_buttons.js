@@ -38,6 +38,19 @@ function initializeDownloadButtons() {
             }, 100);
         });
     }
+    
+    // Handle repaired plan download button
+    const downloadRepairedPlanBtn = document.getElementById('downloadRepairedPlanBtn');
+    if (downloadRepairedPlanBtn) {
+        downloadRepairedPlanBtn.addEventListener('click', function(e) {
+            setTimeout(() => {
+                this.disabled = true;
+                this.textContent = 'Downloaded';
+                this.classList.remove('btn-primary');
+                this.classList.add('btn-secondary');
+            }, 100);
+        });
+    }
 }
 
 // Initialize when DOM is loaded
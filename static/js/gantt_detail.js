@@ -0,0 +1,92 @@
+// Level-of-detail Gantt functionality
+const DETAIL_FLAG_COLORS = {
+    'OK': '#2ca02c',
+    'SHORT': '#ff7f0e',
+    'LONG': '#1f77b4',
+    'NO OVERLAP': '#d62728',
+    'CONFLICT': '#9467bd'
+};
+
+function detailColor(flag) {
+    const primary = flag.split(', ').find(f => f !== 'OK') || 'OK';
+    return DETAIL_FLAG_COLORS[primary] || 'gray';
+}
+
+function renderDetail(container, data) {
+    const detailDiv = container.querySelector('.lod-detail');
+    if (!data.tracks.length) {
+        Plotly.purge(detailDiv);
+        detailDiv.textContent = 'No tracks in the selected window.';
+        return;
+    }
+    detailDiv.textContent = '';
+
+    const trace = {
+        type: 'bar',
+        orientation: 'h',
+        y: data.tracks.map(t => t.satellite),
+        base: data.tracks.map(t => t.start_hour),
+        x: data.tracks.map(t => t.end_hour - t.start_hour),
+        marker: {
+            color: data.tracks.map(t => detailColor(t.flag)),
+            line: { color: 'black', width: 1 }
+        },
+        hovertext: data.tracks.map(t =>
+            `<b>${t.satellite}</b><br>Start: ${t.start}<br>End: ${t.end}<br>` +
+            `Duration: ${t.duration.toFixed(1)} min<br>Flags: ${t.flag}`),
+        hoverinfo: 'text'
+    };
+    const title = `Full Detail - ${data.gateway}` + (data.truncated ? ' (truncated, zoom further)' : '');
+    Plotly.react(detailDiv, [trace], {
+        title: title,
+        barmode: 'overlay',
+        height: Math.max(400, data.satellites.length * 30),
+        width: 1200,
+        margin: { t: 60, l: 120, r: 150, b: 60 },
+        xaxis: { title: 'Time (24-hour format)', dtick: 1 },
+        yaxis: { type: 'category', categoryorder: 'array', categoryarray: data.satellites, automargin: true },
+        plot_bgcolor: '#f0f0f0'
+    });
+}
+
+function initializeGanttDetail() {
+    document.querySelectorAll('.lod-chart').forEach(container => {
+        const chart = document.getElementById(container.dataset.chartId);
+        if (!chart || !chart.on) return;
+        let pending = null;
+
+        chart.on('plotly_relayout', function(update) {
+            if (update['xaxis.autorange'] || update['yaxis.autorange']) {
+                Plotly.purge(container.querySelector('.lod-detail'));
+                return;
+            }
+            const xRange = chart.layout.xaxis.range;
+            const yRange = chart.layout.yaxis.range;
+            const params = new URLSearchParams({
+                analysis: container.dataset.analysisId,
+                gateway: container.dataset.gateway,
+                x0: xRange[0], x1: xRange[1],
+                y0: yRange[0], y1: yRange[1]
+            });
+
+            // Only the latest zoom window matters
+            if (pending) pending.abort();
+            pending = new AbortController();
+            fetch(`/gantt_detail?${params}`, { signal: pending.signal })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.error) {
+                        container.querySelector('.lod-detail').textContent = data.error;
+                        return;
+                    }
+                    renderDetail(container, data);
+                })
+                .catch(err => {
+                    if (err.name !== 'AbortError') console.error(err);
+                });
+        });
+    });
+}
+
+// Initialize when DOM is loaded (Plotly charts are created inline before this runs)
+document.addEventListener('DOMContentLoaded', initializeGanttDetail);
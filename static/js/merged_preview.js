@@ -0,0 +1,63 @@
+// Merged plan preview paging functionality
+function initializeMergedPreview() {
+    const controls = document.querySelector('.merged-preview-controls');
+    const preview = document.getElementById('mergedPreview');
+    if (!controls || !preview) return;
+
+    const pageLines = parseInt(controls.dataset.pageLines, 10);
+    const lineInput = document.getElementById('previewLine');
+    const gatewaySelect = document.getElementById('previewGateway');
+    const range = document.getElementById('previewRange');
+    let current = { start: 1, end: 0, total_lines: parseInt(controls.dataset.totalLines, 10) };
+    let pending = null;
+
+    function showPage(data) {
+        current = data;
+        preview.textContent = data.lines.join('\n');
+        range.textContent = `Lines ${data.start}-${data.end} of ${data.total_lines}`;
+        lineInput.value = data.start;
+        document.getElementById('previewPrev').disabled = data.start <= 1;
+        document.getElementById('previewNext').disabled = data.end >= data.total_lines;
+    }
+
+    function loadPage(params) {
+        // Only the latest requested page matters
+        if (pending) pending.abort();
+        pending = new AbortController();
+        params.set('count', pageLines);
+        fetch(`/merged_preview?${params}`, { signal: pending.signal })
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    range.textContent = data.error;
+                    return;
+                }
+                showPage(data);
+            })
+            .catch(err => {
+                if (err.name !== 'AbortError') console.error(err);
+            });
+    }
+
+    document.getElementById('previewPrev').addEventListener('click', () => {
+        loadPage(new URLSearchParams({ start: Math.max(1, current.start - pageLines) }));
+    });
+    document.getElementById('previewNext').addEventListener('click', () => {
+        loadPage(new URLSearchParams({ start: current.start + pageLines }));
+    });
+    document.getElementById('previewGo').addEventListener('click', () => {
+        loadPage(new URLSearchParams({ start: parseInt(lineInput.value, 10) || 1 }));
+    });
+    lineInput.addEventListener('keydown', e => {
+        if (e.key === 'Enter') document.getElementById('previewGo').click();
+    });
+    gatewaySelect.addEventListener('change', () => {
+        if (gatewaySelect.value) loadPage(new URLSearchParams({ gateway: gatewaySelect.value }));
+    });
+
+    document.getElementById('previewPrev').disabled = true;
+    document.getElementById('previewNext').disabled = current.total_lines <= pageLines;
+}
+
+// Initialize when DOM is loaded
+document.addEventListener('DOMContentLoaded', initializeMergedPreview);
@@ -0,0 +1,56 @@
+// Analysis progress functionality
+const PROGRESS_STAGES = {
+    parsing: { percent: 10, text: () => 'Parsing and flagging tracks...' },
+    parsed: { percent: 30, text: e => `Parsed ${e.tracks} tracks across ${e.gateways} gateways` },
+    table: { percent: 45, text: e => `Built schedule table (${e.rows} rows)` },
+    charts: { percent: null, text: e => `Charted ${e.gateways_charted} of ${e.gateways} gateways` },
+    rendered: { percent: 100, text: e => `Rendered ${(e.bytes_rendered / 1024).toFixed(0)} KB, loading results...` },
+    error: { percent: 100, text: e => `Failed: ${e.message}` }
+};
+
+function initializeProgress() {
+    document.querySelectorAll('form').forEach(form => {
+        const progressInput = form.querySelector('input[name="progress_id"]');
+        const status = form.querySelector('.progress-status');
+        if (!progressInput || !status || !window.EventSource) return;
+
+        form.addEventListener('submit', function() {
+            const jobId = (window.crypto && crypto.randomUUID)
+                ? crypto.randomUUID()
+                : Date.now().toString(36) + Math.random().toString(36).slice(2);
+            progressInput.value = jobId;
+
+            const bar = status.querySelector('.progress-bar');
+            const text = status.querySelector('.progress-text');
+            const submitBtn = form.querySelector('button[type="submit"]');
+            status.hidden = false;
+            bar.style.width = '5%';
+            text.textContent = 'Uploading...';
+            if (submitBtn) submitBtn.disabled = true;
+
+            const source = new EventSource(`/progress/${encodeURIComponent(jobId)}`);
+            source.onmessage = function(message) {
+                const event = JSON.parse(message.data);
+                const stage = PROGRESS_STAGES[event.stage];
+                if (!stage) return;
+                let percent = stage.percent;
+                if (event.stage === 'charts') {
+                    percent = 45 + Math.round(50 * event.gateways_charted / event.gateways);
+                }
+                bar.style.width = `${percent}%`;
+                // Stage memory peaks are only present when the server profiles memory
+                const memory = event.peak_mb !== undefined ? `, peak ${event.peak_mb} MB` : '';
+                text.textContent = `${stage.text(event)} (${event.elapsed.toFixed(1)}s${memory})`;
+                if (event.stage === 'error') {
+                    bar.classList.add('bg-danger');
+                    source.close();
+                }
+            };
+            source.addEventListener('timeout', () => source.close());
+            source.onerror = () => source.close();
+        });
+    });
+}
+
+// Initialize when DOM is loaded
+document.addEventListener('DOMContentLoaded', initializeProgress);
@@ -1,5 +1,131 @@
 // Table filtering functionality
+const VIRTUAL_ROW_BUFFER = 20;
+
+function populateFilter(select, values) {
+    values.sort().forEach(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = value;
+        select.appendChild(option);
+    });
+}
+
+// Intersect two ascending row-index lists
+function intersectIndexes(a, b) {
+    const result = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) { result.push(a[i]); i++; j++; }
+        else if (a[i] < b[j]) i++;
+        else j++;
+    }
+    return result;
+}
+
+function initializeVirtualTable(dataElement) {
+    const data = JSON.parse(dataElement.textContent);
+    const container = document.getElementById('tableContainer');
+    const flagged = new Set(data.flagged);
+    const allRows = data.rows.map((_, i) => i);
+    let visibleRows = allRows;
+    let rowHeight = 0;
+
+    const scroller = document.createElement('div');
+    scroller.className = 'virtual-table-scroll';
+    const table = document.createElement('table');
+    table.className = 'table table-bordered table-sm table-hover';
+    const thead = table.createTHead();
+    const headerRow = thead.insertRow();
+    data.columns.forEach(column => {
+        const th = document.createElement('th');
+        th.textContent = column;
+        headerRow.appendChild(th);
+    });
+    const tbody = table.createTBody();
+    scroller.appendChild(table);
+    container.appendChild(scroller);
+
+    function spacer(height) {
+        const tr = document.createElement('tr');
+        const td = document.createElement('td');
+        td.colSpan = data.columns.length;
+        td.style.height = `${height}px`;
+        td.style.padding = '0';
+        td.style.border = 'none';
+        tr.appendChild(td);
+        return tr;
+    }
+
+    function buildRow(rowIndex) {
+        const tr = document.createElement('tr');
+        if (flagged.has(rowIndex)) tr.className = 'flagged-row';
+        data.rows[rowIndex].forEach(value => {
+            const td = document.createElement('td');
+            td.textContent = value;
+            tr.appendChild(td);
+        });
+        return tr;
+    }
+
+    // Only the rows in view (plus a buffer) exist in the DOM; spacers keep the scrollbar honest
+    function render() {
+        if (!rowHeight && visibleRows.length) {
+            tbody.replaceChildren(buildRow(visibleRows[0]));
+            rowHeight = tbody.firstChild.getBoundingClientRect().height || 30;
+        }
+        const viewHeight = scroller.clientHeight || 600;
+        const first = Math.max(0, Math.floor(scroller.scrollTop / (rowHeight || 30)) - VIRTUAL_ROW_BUFFER);
+        const last = Math.min(visibleRows.length, first + Math.ceil(viewHeight / (rowHeight || 30)) + 2 * VIRTUAL_ROW_BUFFER);
+
+        const fragment = document.createDocumentFragment();
+        fragment.appendChild(spacer(first * rowHeight));
+        for (let i = first; i < last; i++) {
+            fragment.appendChild(buildRow(visibleRows[i]));
+        }
+        fragment.appendChild(spacer((visibleRows.length - last) * rowHeight));
+        tbody.replaceChildren(fragment);
+    }
+
+    let scheduled = false;
+    scroller.addEventListener('scroll', () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; render(); });
+    });
+
+    const gatewayFilter = document.getElementById('gatewayFilter');
+    const satelliteFilter = document.getElementById('satelliteFilter');
+    const filters = [];
+    if (gatewayFilter && data.index.Gateway) filters.push([gatewayFilter, data.index.Gateway]);
+    if (satelliteFilter && data.index.Satellite) filters.push([satelliteFilter, data.index.Satellite]);
+
+    function filterTable() {
+        visibleRows = allRows;
+        filters.forEach(([select, index]) => {
+            if (select.value) {
+                const matches = index[select.value] || [];
+                visibleRows = visibleRows === allRows ? matches : intersectIndexes(visibleRows, matches);
+            }
+        });
+        scroller.scrollTop = 0;
+        render();
+        console.log(`Showing ${visibleRows.length} of ${allRows.length} rows`);
+    }
+
+    filters.forEach(([select, index]) => {
+        populateFilter(select, Object.keys(index));
+        select.addEventListener('change', filterTable);
+    });
+    render();
+}
+
 function initializeTableFilters() {
+    const tableData = document.getElementById('tableData');
+    if (tableData) {
+        initializeVirtualTable(tableData);
+        return;
+    }
+
     const originalTable = document.querySelector('#tableContainer table');
     if (!originalTable) return;
     
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Table Render Module
+Builds the schedule tables shown on the analysis result pages.
+"""
+
+from html import escape
+
+# Tables with more rows than this are shipped as JSON and rendered by a virtual scroller
+VIRTUAL_TABLE_THRESHOLD = 2000
+
+# Rows per chunk handed to the template when streaming an HTML table
+TABLE_CHUNK_ROWS = 500
+TABLE_CLASSES = "table table-bordered table-sm table-hover"
+
+def format_cell(value):
+    """Format a cell value the same way the rendered HTML table shows it."""
+    if isinstance(value, float):
+        return f"{value:.6f}"
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+def build_table_payload(df, index_columns):
+    """Build a compact JSON-ready table with per-value row-index lists for filtering."""
+    columns = list(df.columns)
+    rows = [[format_cell(v) for v in row] for row in df.itertuples(index=False, name=None)]
+
+    # Row indices per distinct value, in ascending row order so the client can intersect by merging
+    index = {}
+    for column in index_columns:
+        positions = {}
+        for i, value in enumerate(df[column]):
+            positions.setdefault(str(value), []).append(i)
+        index[column] = positions
+
+    return {
+        'columns': columns,
+        'rows': rows,
+        'flagged': [i for i, flag in enumerate(df['Flag']) if flag != 'OK'],
+        'index': index
+    }
+
+def column_strings(series):
+    """Format a whole column at once, matching format_cell, with HTML escaping for text."""
+    kind = series.dtype.kind
+    if kind == 'M':
+        return series.dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+    if kind == 'f':
+        return [f"{value:.6f}" for value in series]
+    if kind in 'iub':
+        return series.astype(str).tolist()
+    return [escape(format_cell(value)) for value in series]
+
+def render_table_chunks(df, chunk_rows=TABLE_CHUNK_ROWS):
+    """Yield an HTML table in chunks of rows.
+
+    Flagged rows (Flag other than OK) get a single `flagged-row` class instead of
+    per-cell styles, so the markup stays proportional to the data.
+    """
+    header = ''.join(f"<th>{escape(str(column))}</th>" for column in df.columns)
+    yield f'<table class="{TABLE_CLASSES}"><thead><tr>{header}</tr></thead><tbody>'
+
+    cells = zip(*(column_strings(df[column]) for column in df.columns))
+    flags = df['Flag'].tolist()
+    rows = []
+    for flag, row in zip(flags, cells):
+        row_open = '<tr>' if flag == 'OK' else '<tr class="flagged-row">'
+        rows.append(row_open + '<td>' + '</td><td>'.join(row) + '</td></tr>')
+        if len(rows) == chunk_rows:
+            yield '\n'.join(rows)
+            rows = []
+    if rows:
+        yield '\n'.join(rows)
+    yield '</tbody></table>'
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Upload Limits Module
+Rejects oversized uploads per form type before any parsing is done.
+"""
+
+import zlib
+from compression import open_upload
+
+MB = 1024 * 1024
+
+# Per form type: upload size limit in bytes (as sent and after decompression) and track limit
+UPLOAD_LIMITS = {
+    'xml_analysis': {'max_bytes': 20 * MB, 'max_tracks': 5000},
+    'plan_merge': {'max_bytes': 50 * MB, 'max_tracks': 200000},
+    'plan_analysis': {'max_bytes': 50 * MB, 'max_tracks': 200000},
+    'plan_batch': {'max_bytes': 50 * MB, 'max_tracks': 200000},
+}
+
+# Upload fields checked per form type, their file extension and the byte token that marks one track
+UPLOAD_FIELDS = {
+    'xml_analysis': (('file',), '.xml', b'<Track'),
+    'plan_merge': (('old_plan', 'new_gateway'), '.txt', b' DAT RECUR '),
+    'plan_analysis': (('full_plan',), '.txt', b' DAT RECUR '),
+    'plan_batch': (('full_plan',), '.txt', b' DAT RECUR '),
+}
+
+# Uploads are scanned in chunks of this many bytes
+SCAN_CHUNK_BYTES = 1024 * 1024
+
+def format_megabytes(size):
+    """Format a byte count as megabytes for messages."""
+    return f"{size / MB:.3g} MB"
+
+def max_request_bytes():
+    """Largest request body any form accepts, used as the app-wide hard limit."""
+    # Multipart framing and form fields add a little on top of the files themselves
+    return max(limits['max_bytes'] for limits in UPLOAD_LIMITS.values()) + MB
+
+def count_tracks(stream, token, max_bytes):
+    """Count track tokens in a stream without parsing it; returns (tracks, bytes read).
+
+    Stops early once more than `max_bytes` have been read.
+    """
+    tracks = 0
+    total = 0
+    tail = b''
+    while total <= max_bytes:
+        chunk = stream.read(SCAN_CHUNK_BYTES)
+        if not chunk:
+            break
+        total += len(chunk)
+        # Keep the end of the previous chunk so tokens split across chunks are still found
+        data = tail + chunk
+        tracks += data.count(token)
+        tail = data[-(len(token) - 1):]
+    return tracks, total
+
+def check_upload_limits(form_type, request):
+    """Return an error message if a form's uploads exceed its limits, else None.
+
+    Only the file a handler will actually read is counted: for a zip holding several
+    gateway XMLs that is the member named after the form's gateway, as open_upload picks it.
+    Files are only scanned for track tokens, and their streams are rewound afterwards so
+    the handler reads them from the start. Uploads that cannot be opened are left for the
+    handler to report.
+    """
+    limits = UPLOAD_LIMITS.get(form_type)
+    if limits is None:
+        return None
+
+    max_bytes = limits['max_bytes']
+    if request.content_length is not None and request.content_length > max_bytes + MB:
+        return f"Upload too large: limit is {format_megabytes(max_bytes)}"
+
+    fields, extension, token = UPLOAD_FIELDS[form_type]
+    preferred_name = request.form.get('gateway')
+    tracks = 0
+    for field in fields:
+        file_storage = request.files.get(field)
+        if not file_storage or not file_storage.filename:
+            continue
+        try:
+            stream = open_upload(file_storage, extension, preferred_name=preferred_name)
+            upload_tracks, upload_bytes = count_tracks(stream, token, max_bytes)
+            if upload_bytes > max_bytes:
+                return f"Upload too large: {file_storage.filename} exceeds {format_megabytes(max_bytes)} uncompressed"
+            tracks += upload_tracks
+        except (ValueError, OSError, EOFError, zlib.error):
+            pass
+        finally:
+            file_storage.stream.seek(0)
+
+    if tracks > limits['max_tracks']:
+        return f"Upload has too many tracks: {tracks} (limit {limits['max_tracks']})"
+    return None
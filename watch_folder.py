@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Watch Folder Module
+Daemon that watches a directory of gateway XML files and keeps a master plan merged incrementally.
+
+Usage:
+    python watch_folder.py WATCH_DIR --plan master_plan.txt --deploy-date YYYYMMDD --deploy-time HH:MM:SS
+
+Each XML file is named after its gateway (e.g. GS_ALPHA.xml). Only files whose size or
+modification time changed are re-parsed; every other gateway keeps its cached tracks, so
+an update costs one parse_xml + build_txt and a splice instead of a whole-plan rebuild.
+"""
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime
+from xml_analysis import parse_xml, build_txt
+from plan_merge import parse_plan_for_merge, update_track_dates, assemble_plan
+
+logger = logging.getLogger("watch_folder")
+
+# Cached state of the master plan and of every gateway XML seen so far
+master_state = {'epoch': None, 'now_time': None, 'gateways': {}, 'dated': {}, 'unwritten': False}
+gateway_cache = {}
+
+def load_master_plan(plan_path):
+    """Parse the master plan once and keep its gateways in memory."""
+    with open(plan_path, encoding='utf-8') as plan_file:
+        content = plan_file.read()
+    lines = content.strip().split('\n')
+    if len(lines) < 3:
+        raise ValueError("Invalid plan file format - insufficient lines")
+    master_state['epoch'] = lines[0].strip()
+    master_state['now_time'] = lines[1].strip()
+    master_state['gateways'] = parse_plan_for_merge(content)
+    master_state['dated'] = {}
+    logger.info("Loaded master plan %s with %d gateways", plan_path, len(master_state['gateways']))
+
+def scan_changed_files(watch_dir):
+    """Return (gateway, path, signature) for XML files that are new or changed since the last scan."""
+    changed = []
+    for entry in os.scandir(watch_dir):
+        if not entry.is_file() or not entry.name.lower().endswith('.xml'):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            # Removed or replaced since the directory was listed; picked up on the next scan
+            continue
+        signature = (stat.st_mtime_ns, stat.st_size)
+        gateway = os.path.splitext(entry.name)[0]
+        cached = gateway_cache.get(gateway)
+        if cached is None or cached['signature'] != signature:
+            changed.append((gateway, entry.path, signature))
+    return changed
+
+def process_gateway_file(gateway, path, signature, deploy_date, deploy_time):
+    """Parse one gateway XML and cache its plan header and track lines."""
+    with open(path, 'rb') as xml_file:
+        df = parse_xml(xml_file, deploy_date)
+    txt_lines = build_txt(df, gateway, deploy_date, deploy_time).strip().split('\n')
+    gateway_cache[gateway] = {
+        'signature': signature,
+        'epoch': txt_lines[0],
+        'now_time': txt_lines[1],
+        'tracks': txt_lines[3:]
+    }
+
+def splice_gateway(gateway):
+    """Splice a cached gateway into the master plan the same way merge_plans does."""
+    cached = gateway_cache[gateway]
+    new_date_str = cached['now_time'][:8]
+
+    # Other gateways are only re-dated when they are not already on the new date
+    for name, tracks in master_state['gateways'].items():
+        if name != gateway and master_state['dated'].get(name) != new_date_str:
+            master_state['gateways'][name] = update_track_dates(tracks, new_date_str)
+            master_state['dated'][name] = new_date_str
+
+    master_state['gateways'][gateway] = cached['tracks']
+    master_state['dated'][gateway] = new_date_str
+    master_state['epoch'] = cached['epoch']
+    master_state['now_time'] = cached['now_time']
+
+def write_master_plan(output_path):
+    """Write the master plan atomically so readers never see a half-written file."""
+    content = assemble_plan(master_state['epoch'], master_state['now_time'], master_state['gateways'])
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as output_file:
+        output_file.write(content)
+    os.replace(temp_path, output_path)
+
+def run_once(watch_dir, output_path, deploy_date, deploy_time):
+    """Process every changed gateway file once; return the gateways that were updated."""
+    updated = []
+    for gateway, path, signature in scan_changed_files(watch_dir):
+        try:
+            process_gateway_file(gateway, path, signature, deploy_date, deploy_time)
+        except (ValueError, OSError) as e:
+            # Remember the signature so a broken file is not retried until it changes again
+            gateway_cache[gateway] = dict(gateway_cache.get(gateway, {}), signature=signature)
+            logger.error("Skipping %s: %s", path, e)
+            continue
+        splice_gateway(gateway)
+        updated.append(gateway)
+
+    # A plan that failed to write last time is written again even if nothing changed since
+    if updated or master_state['unwritten']:
+        master_state['unwritten'] = True
+        write_master_plan(output_path)
+        master_state['unwritten'] = False
+        logger.info("Merged %s into %s", ", ".join(updated) or "pending changes", output_path)
+    return updated
+
+def watch(watch_dir, plan_path, output_path, deploy_date, deploy_time, interval):
+    """Poll the watch directory forever, merging changed gateways as they appear."""
+    load_master_plan(plan_path)
+    logger.info("Watching %s every %.1fs", watch_dir, interval)
+    while True:
+        try:
+            run_once(watch_dir, output_path, deploy_date, deploy_time)
+        except OSError as e:
+            # e.g. the watch directory is unmounted or the output is not writable; keep watching
+            logger.error("Watch pass failed: %s", e)
+        time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a folder of gateway XML files and keep a master plan merged.")
+    parser.add_argument('watch_dir', help="Directory containing one <gateway>.xml file per gateway")
+    parser.add_argument('--plan', required=True, help="Master plan TXT file to merge into")
+    parser.add_argument('--output', help="Where to write the merged plan (defaults to updating --plan in place)")
+    parser.add_argument('--deploy-date', required=True, help="Deploy date (YYYYMMDD)")
+    parser.add_argument('--deploy-time', required=True, help="Deploy time (HH:MM:SS)")
+    parser.add_argument('--interval', type=float, default=5.0, help="Polling interval in seconds")
+    parser.add_argument('--once', action='store_true', help="Process the current files once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    deploy_date = datetime.strptime(args.deploy_date, "%Y%m%d")
+    deploy_time = datetime.strptime(args.deploy_time, "%H:%M:%S")
+    output_path = args.output or args.plan
+
+    if args.once:
+        load_master_plan(args.plan)
+        run_once(args.watch_dir, output_path, deploy_date, deploy_time)
+    else:
+        watch(args.watch_dir, args.plan, output_path, deploy_date, deploy_time, args.interval)
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,13 @@ XML Analysis Module
 Handles XML file processing, validation, and visualization.
 """
 
-from flask import render_template, request, send_file, flash, redirect, url_for
+from flask import stream_template, request, send_file, flash, redirect, url_for, Response
 import xml.etree.ElementTree as ET
-import pandas as pd
 from datetime import datetime, timedelta
-import plotly.graph_objects as go
 from io import BytesIO
+from compression import is_accepted_upload, open_upload
+from table_render import VIRTUAL_TABLE_THRESHOLD, build_table_payload, render_table_chunks
+from progress import request_job_id, start_progress, report_progress, finish_progress, release_progress, stream_with_progress
 
 # Global memory buffers for file downloads
 stored_txt_file = BytesIO()
@@ -17,6 +18,7 @@ download_used = {'txt': False}
 
 def parse_xml(file_stream, deploy_date):
     """Parse XML file and expand 6-hour schedule to 24-hour format."""
+    import pandas as pd
     try:
         tree = ET.parse(file_stream)
         root = tree.getroot()
@@ -112,6 +114,7 @@ def parse_xml(file_stream, deploy_date):
 
 def create_consolidated_gantt(df):
     """Create a consolidated Gantt chart visualization."""
+    import plotly.graph_objects as go
     satellites_per_6h = len(df) // 4
     unique_satellites = df.iloc[:satellites_per_6h]['Satellite'].tolist()
     
@@ -249,32 +252,46 @@ def create_consolidated_gantt(df):
     
     return fig
 
-def generate_txt(df, gateway_name, deploy_date, deploy_time):
-    """Generate TXT output file from DataFrame."""
-    global stored_txt_file, download_used
-    stored_txt_file = BytesIO()
-    download_used['txt'] = False
+def plan_timestamp_strings(series):
+    """Format a datetime column as plan timestamps (YYYYMMDDHHMMSS.000) in bulk.
+
+    The date and time fields are packed into one integer per row, which is much
+    faster than strftime on every value.
+    """
+    packed = (series.dt.year.to_numpy().astype('int64') * 10**10
+              + series.dt.month.to_numpy() * 10**8
+              + series.dt.day.to_numpy() * 10**6
+              + series.dt.hour.to_numpy() * 10**4
+              + series.dt.minute.to_numpy() * 100
+              + series.dt.second.to_numpy())
+    return [f"{value}.000" for value in packed.tolist()]
 
+def build_txt(df, gateway_name, deploy_date, deploy_time):
+    """Build the TXT plan content for one gateway from DataFrame."""
     first_start_time = df.iloc[0]["Start"]
     epoch_millis = int(first_start_time.timestamp() * 1000)
     
     deploy_time = datetime.combine(deploy_date.date(), deploy_time.time())
     deploy_str = deploy_time.strftime("%Y%m%d%H%M%S.000")
 
-    output = f"{epoch_millis}\n"
-    output += f"{deploy_str}\n"
-    output += f"{gateway_name}\n"
+    track_lines = map(" ".join, zip(df['Satellite'].astype(str), df['Data'].astype(str), df['Reccurance'].astype(str),
+                                    plan_timestamp_strings(df['Start']), plan_timestamp_strings(df['End'])))
+    return f"{epoch_millis}\n{deploy_str}\n{gateway_name}\n" + "\n".join(track_lines) + "\n"
 
-    for _, row in df.iterrows():
-        start_str = row["Start"].strftime("%Y%m%d%H%M%S.000")
-        end_str = row["End"].strftime("%Y%m%d%H%M%S.000")
-        output += f"{row['Satellite']} {row['Data']} {row['Reccurance']} {start_str} {end_str}\n"
+def generate_txt(df, gateway_name, deploy_date, deploy_time):
+    """Generate TXT output file from DataFrame."""
+    global stored_txt_file, download_used
+    stored_txt_file = BytesIO()
+    download_used['txt'] = False
 
+    output = build_txt(df, gateway_name, deploy_date, deploy_time)
     stored_txt_file.write(output.encode("utf-8"))
     stored_txt_file.seek(0)
 
 def handle_xml_analysis(request):
     """Handle XML analysis form submission."""
+    progress_id = request_job_id(request)
+    start_progress(progress_id, 'xml_analysis')
     try:
         xml_file = request.files['file']
         gateway_name = request.form['gateway']
@@ -287,26 +304,26 @@ def handle_xml_analysis(request):
             flash("Missing file or gateway name or deploy date or deploy time", "error")
             return redirect(url_for('index'))
 
-        if not xml_file.filename.lower().endswith('.xml'):
+        if not is_accepted_upload(xml_file.filename, '.xml'):
             flash("Wrong file type. Please upload an XML file.", "error")
             return redirect(url_for('index'))
 
-        df = parse_xml(xml_file.stream, deploy_date)
+        # A zip may hold several gateway XMLs; the one named after the gateway is analyzed
+        df = parse_xml(open_upload(xml_file, '.xml', preferred_name=gateway_name), deploy_date)
+        report_progress(progress_id, 'parsed', tracks=len(df))
         generate_txt(df, gateway_name, deploy_date, deploy_time)
+        report_progress(progress_id, 'txt')
 
         df_reset = df.reset_index(drop=True)
 
-        def flag_color(v):
-                    if 'SHORT' in v or 'LONG' in v or 'NO OVERLAP' in v:
-                        return 'background-color: #f8d7da;'
-                    return ''
-        
-        styled_table = df_reset.style \
-            .set_table_attributes('class="table table-bordered table-sm table-hover"') \
-            .hide(axis='index') \
-            .applymap(flag_color, subset=['Flag'])
+        # Large tables are filtered and rendered client-side from indexed JSON
+        table_data = None
+        if len(df_reset) > VIRTUAL_TABLE_THRESHOLD:
+            table_data = build_table_payload(df_reset, ['Satellite'])
 
-        styled_table_html = styled_table.to_html()
+        # Smaller tables are streamed into the page as HTML, flagged rows highlighted by class
+        table_chunks = render_table_chunks(df_reset) if table_data is None else []
+        report_progress(progress_id, 'table', rows=len(df_reset))
 
         # Create summary statistics
         first_start = df['Start'].min()
@@ -331,15 +348,21 @@ def handle_xml_analysis(request):
 
         fig = create_consolidated_gantt(df)
         gantt_html = fig.to_html(full_html=False)
+        report_progress(progress_id, 'charts', gateways_charted=1, gateways=1)
 
-        return render_template('xml_analysis.html', table=styled_table_html, stats=stats, chart=gantt_html, gateway_name=gateway_name)
+        page = stream_template('xml_analysis.html', table=table_chunks, table_data=table_data, stats=stats, chart=gantt_html, gateway_name=gateway_name)
+        return Response(stream_with_progress(progress_id, page), mimetype='text/html')
 
     except ValueError as e:
+        finish_progress(progress_id, e)
         flash(str(e), "error")
         return redirect(url_for('index'))
     except Exception as e:
+        finish_progress(progress_id, e)
         flash("Error with file.", "error")
         return redirect(url_for('index'))
+    finally:
+        release_progress(progress_id)
 
 # Route to download the XML-generated output .txt file
 def download_txt():